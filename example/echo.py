@@ -1,7 +1,7 @@
 import asyncio
 import contextlib
 
-from aioterminal import char_mode, read_chars
+from aioterminal import char_mode, read_chunks
 from aioterminal.keys import code_to_key
 from aioterminal.parser import parse
 
@@ -9,8 +9,8 @@ from aioterminal.parser import parse
 async def main():
     with char_mode():
         print("type keys to see echo - ctrl-c to quit")
-        async with contextlib.aclosing(read_chars()) as each_char:
-            async for c in parse(each_char):
+        async with contextlib.aclosing(read_chunks()) as each_chunk:
+            async for c in parse(each_chunk):
                 print(code_to_key(c), repr(c), sep="\t")
 
 
@@ -1,4 +1,5 @@
 import asyncio
+import codecs
 import contextlib
 import errno
 import functools
@@ -33,10 +34,15 @@ def char_mode(fd: int = ...) -> typing.ContextManager:
     raise NotImplementedError
 
 
-def read_chars(fd: int = ...) -> typing.AsyncGenerator[str, typing.Any]:
+def read_chars(
+    fd: int = ..., errors: str = ..., max_buffered: int | None = ...
+) -> typing.AsyncGenerator[str, typing.Any]:
     """
     Async generator that returns each character from stdin as it becomes available.
 
+    The generator ends when the end of the input is reached, e.g. when the
+    terminal hangs up.
+
     Since this is an async generator, if you break out of the for loop, you need
     to be sure to close the generator::
 
@@ -48,6 +54,94 @@ def read_chars(fd: int = ...) -> typing.AsyncGenerator[str, typing.Any]:
 
     Args:
         fd: The file descriptor of a terminal. Default uses stdin.
+        errors: The error handling scheme used when decoding the input, e.g.
+            ``"strict"`` (default) or ``"replace"``. Ignored on Windows.
+        max_buffered: The number of characters that can be read ahead of the
+            consumer. When this is reached, reading is paused and further
+            input stays in the kernel (or console) buffer until the consumer
+            catches up. This may be exceeded by up to one read. Default
+            ``None`` is unlimited.
+
+    Raises:
+        OSError: with ``errno.ENOTTY`` if *fd* is not a terminal
+        ValueError: if *max_buffered* is less than 1
+        UnicodeDecodeError: if the input is not valid and *errors* is ``"strict"``
+    """
+    raise NotImplementedError
+
+
+def read_chunks(
+    fd: int = ..., errors: str = ..., max_buffered: int | None = ...
+) -> typing.AsyncGenerator[str, typing.Any]:
+    """
+    Async generator that returns chunks of characters from stdin as they become
+    available.
+
+    This is the same as :func:`read_chars` except that everything that was
+    read at once is returned as a single string instead of one character at a
+    time. This is more efficient when a lot of input arrives at once, e.g.
+    when pasting text. The result can be passed directly to
+    :func:`aioterminal.parser.parse`.
+
+    The generator ends when the end of the input is reached, e.g. when the
+    terminal hangs up.
+
+    Since this is an async generator, if you break out of the for loop, you need
+    to be sure to close the generator::
+
+        async with contextlib.aclosing(read_chunks()) as each_chunk:
+            async for chunk in each_chunk:
+                ...
+                if ...:
+                    break
+
+    Multi-byte characters that are split across reads are kept until they
+    are complete, so a chunk never ends with a partial character.
+
+    Args:
+        fd: The file descriptor of a terminal. Default uses stdin.
+        errors: The error handling scheme used when decoding the input, e.g.
+            ``"strict"`` (default) or ``"replace"``. Ignored on Windows.
+        max_buffered: The number of characters that can be read ahead of the
+            consumer. When this is reached, reading is paused and further
+            input stays in the kernel (or console) buffer until the consumer
+            catches up. This may be exceeded by up to one read. Default
+            ``None`` is unlimited.
+
+    Raises:
+        OSError: with ``errno.ENOTTY`` if *fd* is not a terminal
+        ValueError: if *max_buffered* is less than 1
+        UnicodeDecodeError: if the input is not valid and *errors* is ``"strict"``
+    """
+    raise NotImplementedError
+
+
+def read_bytes(
+    fd: int = ..., size: int = ...
+) -> typing.AsyncGenerator[memoryview, typing.Any]:
+    """
+    Async generator that returns raw bytes from stdin as they become available.
+
+    Unlike :func:`read_chunks`, no decoding is done. On POSIX systems, the data
+    is read directly into a buffer that is allocated once and reused for each
+    read, so the returned :class:`memoryview` is only valid until the next
+    iteration. Use ``bytes(view)`` to keep a copy.
+
+    The generator ends when the end of the input is reached, e.g. when the
+    terminal hangs up.
+
+    Since this is an async generator, if you break out of the for loop, you need
+    to be sure to close the generator::
+
+        async with contextlib.aclosing(read_bytes()) as each_read:
+            async for view in each_read:
+                ...
+                if ...:
+                    break
+
+    Args:
+        fd: The file descriptor of a terminal. Default uses stdin.
+        size: The size of the read buffer. Default is 4096.
 
     Raises:
         OSError: with ``errno.ENOTTY`` if *fd* is not a terminal
@@ -94,31 +188,132 @@ if _ON_POSIX:
         finally:
             termios.tcsetattr(fd, termios.TCSAFLUSH, old_attr)
 
-    @functools.wraps(read_chars)
-    async def read_chars(fd=None):
+    @functools.wraps(read_chunks)
+    async def read_chunks(fd=None, errors="strict", max_buffered=None):
         fd = _assert_is_a_tty(fd)
 
+        if max_buffered is not None and max_buffered < 1:
+            raise ValueError("max_buffered must be at least 1")
+
         with contextlib.ExitStack() as stack:
             loop = asyncio.get_running_loop()
-            queue = asyncio.Queue[str]()
+            queue = asyncio.Queue[str | Exception | None]()
+            buffered = 0
+            paused = False
 
             # dup fd to get unique fd for add/remove reader
             f = stack.enter_context(os.fdopen(os.dup(fd)))
 
+            # multi-byte characters may be split across reads
+            decoder = codecs.getincrementaldecoder(f.encoding)(errors)
+
             def on_notify():
-                # Have to use read1 to avoid blocking.
-                # NB: setting stdin to O_NONBLOCK also sets stdout which
-                # which breaks things like print()
-                x = f.buffer.read1()
-                queue.put_nowait(x.decode(f.encoding))
+                nonlocal buffered, paused
+
+                try:
+                    try:
+                        # Have to use read1 to avoid blocking.
+                        # NB: setting stdin to O_NONBLOCK also sets stdout which
+                        # which breaks things like print()
+                        data = f.buffer.read1()
+                    except OSError as ex:
+                        # reading a pty fails with EIO after the other end hangs up
+                        if ex.errno != errno.EIO:
+                            raise
+
+                        data = b""
+
+                    x = decoder.decode(data, final=not data)
+                except (OSError, UnicodeDecodeError) as ex:
+                    # Raising here would only call the event loop exception
+                    # handler and the reader would keep being called, so the
+                    # error is raised in the consumer instead.
+                    if isinstance(ex, UnicodeDecodeError) and ex.start:
+                        queue.put_nowait(ex.object[: ex.start].decode(f.encoding))
+
+                    loop.remove_reader(f)
+                    paused = False
+                    queue.put_nowait(ex)
+                    return
+
+                if x:
+                    queue.put_nowait(x)
+                    buffered += len(x)
+
+                    if max_buffered is not None and buffered >= max_buffered:
+                        loop.remove_reader(f)
+                        paused = True
+
+                if not data:
+                    # EOF - the fd would be readable forever, so the reader
+                    # has to be removed to avoid spinning
+                    loop.remove_reader(f)
+                    paused = False
+                    queue.put_nowait(None)
 
             loop.add_reader(f, on_notify)
             stack.callback(loop.remove_reader, f)
 
             while True:
-                # REVISIT: how to handle EOF?
-                for c in await queue.get():
-                    yield c
+                x = await queue.get()
+
+                if x is None:
+                    return
+
+                if isinstance(x, Exception):
+                    raise x
+
+                buffered -= len(x)
+
+                if paused and buffered < max_buffered:
+                    loop.add_reader(f, on_notify)
+                    paused = False
+
+                yield x
+
+    @functools.wraps(read_bytes)
+    async def read_bytes(fd=None, size=4096):
+        fd = _assert_is_a_tty(fd)
+
+        with contextlib.ExitStack() as stack:
+            loop = asyncio.get_running_loop()
+            buf = bytearray(size)
+            view = memoryview(buf)
+
+            # dup fd to get unique fd for add/remove reader
+            fd = os.dup(fd)
+            stack.callback(os.close, fd)
+
+            def on_notify():
+                if not readable.done():
+                    readable.set_result(None)
+
+            while True:
+                # The reader is only registered while waiting so that unread
+                # data stays in the kernel buffer while the consumer is busy
+                # with the data from the previous read.
+                readable = loop.create_future()
+                loop.add_reader(fd, on_notify)
+
+                try:
+                    await readable
+                finally:
+                    loop.remove_reader(fd)
+
+                try:
+                    # fd is readable, so this won't block
+                    n = os.readv(fd, [buf])
+                except OSError as ex:
+                    # reading a pty fails with EIO after the other end hangs up
+                    if ex.errno != errno.EIO:
+                        raise
+
+                    n = 0
+
+                if n == 0:
+                    return
+
+                yield view[:n]
 
 else:
     import ctypes
@@ -262,21 +457,110 @@ else:
         finally:
             _SetConsoleMode(handle, old_mode)
 
-    @functools.wraps(read_chars)
-    async def read_chars(fd=None):
+    @functools.wraps(read_chunks)
+    async def read_chunks(fd=None, errors="strict", max_buffered=None):
         fd = _assert_is_a_tty(fd)
 
+        if max_buffered is not None and max_buffered < 1:
+            raise ValueError("max_buffered must be at least 1")
+
         with contextlib.ExitStack() as stack:
             handle = msvcrt.get_osfhandle(fd)
             loop = asyncio.get_running_loop()
-            queue = asyncio.Queue[str]()
+            queue = asyncio.Queue[str | None]()
             event = threading.Event()
+            buffered = 0
+            resume = threading.Event()
+            resume.set()
+
+            def on_read(x):
+                nonlocal buffered
+
+                queue.put_nowait(x)
+
+                if x is None:
+                    return
+
+                buffered += len(x)
+
+                if max_buffered is not None and buffered >= max_buffered:
+                    resume.clear()
 
             def read_thread():
                 buf = (wintypes.WCHAR * 256)()
 
                 while not event.is_set():
-                    x = _ReadConsole(handle, buf, len(buf))
+                    try:
+                        x = _ReadConsole(handle, buf, len(buf))
+                    except OSError:
+                        if event.is_set():
+                            # canceled by abort()
+                            return
+
+                        # console was closed
+                        loop.call_soon_threadsafe(on_read, None)
+                        return
+
+                    if x:
+                        loop.call_soon_threadsafe(on_read, x)
+
+                    resume.wait()
+
+            t = threading.Thread(target=read_thread, daemon=True)
+            t.start()
+
+            t_handle = _OpenThread(_THREAD_TERMINATE, False, t.native_id)
+            stack.callback(_CloseHandle, t_handle)
+
+            def abort():
+                if t.is_alive():
+                    event.set()
+                    resume.set()
+                    _CancelSynchronousIo(t_handle)
+
+            stack.callback(abort)
+
+            while True:
+                x = await queue.get()
+
+                if x is None:
+                    return
+
+                buffered -= len(x)
+
+                if not resume.is_set() and buffered < max_buffered:
+                    resume.set()
+
+                yield x
+
+    @functools.wraps(read_bytes)
+    async def read_bytes(fd=None, size=4096):
+        fd = _assert_is_a_tty(fd)
+
+        with contextlib.ExitStack() as stack:
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue[bytes | None]()
+            event = threading.Event()
+
+            # There is no way to wait for a console to be readable with the
+            # proactor event loop, so reads have to be done in a thread and
+            # a new bytes object is returned for each read.
+            def read_thread():
+                while not event.is_set():
+                    try:
+                        x = os.read(fd, size)
+                    except OSError:
+                        if event.is_set():
+                            # canceled by abort()
+                            return
+
+                        x = b""
+
+                    if not x:
+                        # EOF
+                        loop.call_soon_threadsafe(queue.put_nowait, None)
+                        return
+
                     loop.call_soon_threadsafe(queue.put_nowait, x)
 
             t = threading.Thread(target=read_thread, daemon=True)
@@ -293,6 +577,17 @@ else:
             stack.callback(abort)
 
             while True:
-                # REVISIT: how to handle EOF?
-                for c in await queue.get():
-                    yield c
+                x = await queue.get()
+
+                if x is None:
+                    return
+
+                yield memoryview(x)
+
+
+@functools.wraps(read_chars)
+async def read_chars(fd=None, errors="strict", max_buffered=None):
+    async with contextlib.aclosing(read_chunks(fd, errors, max_buffered)) as each_chunk:
+        async for chunk in each_chunk:
+            for c in chunk:
+                yield c
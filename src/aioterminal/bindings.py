@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import typing
+
+from .keys import Key, KeyEvent, Modifier
+
+_MODIFIER_NAMES = {
+    "shift": Modifier.SHIFT,
+    "alt": Modifier.ALT,
+    "ctrl": Modifier.CTRL,
+    "meta": Modifier.META,
+}
+
+_KEY_NAMES = {
+    **{key.name.lower().replace("_", ""): key for key in Key},
+    "up": Key.UP_ARROW,
+    "down": Key.DOWN_ARROW,
+    "left": Key.LEFT_ARROW,
+    "right": Key.RIGHT_ARROW,
+    "esc": Key.ESCAPE,
+    "pgup": Key.PAGE_UP,
+    "pgdn": Key.PAGE_DOWN,
+    "del": Key.DELETE,
+    "ins": Key.INSERT,
+}
+
+_Node = dict[typing.Any, typing.Any]
+"""
+Trie node. Maps the next key to a child node. The ``None`` key holds the
+handler for the sequence ending at this node.
+"""
+
+
+def _lookup_key(event: KeyEvent) -> tuple:
+    # keys like enter can have text or not depending on how they were sent
+    return (
+        (event.key, event.modifiers)
+        if event.key is not None
+        else (event.text, event.modifiers)
+    )
+
+
+def parse_key(spec: str) -> KeyEvent:
+    """
+    Parses a key like ``"Ctrl-X"``, ``"Alt-Up"`` or ``"g"``.
+
+    Modifier names (``Shift``, ``Alt``, ``Ctrl`` and ``Meta``) and key names
+    (e.g. ``Enter``, ``PageUp``, ``F5``) are not case-sensitive. Anything else
+    must be a single character.
+
+    Raises:
+        ValueError: if *spec* is not a valid key
+    """
+    if spec == "-" or spec.endswith("--"):
+        # e.g. Ctrl--
+        prefix, last = spec[:-2], "-"
+    else:
+        prefix, _, last = spec.rpartition("-")
+
+    names = prefix.split("-") if prefix else []
+    modifiers = Modifier.NONE
+
+    for name in names:
+        try:
+            modifiers |= _MODIFIER_NAMES[name.lower()]
+        except KeyError:
+            raise ValueError(f"unknown modifier {name!r} in {spec!r}")
+
+    if len(last) == 1:
+        # terminals can't tell Ctrl+X and Ctrl+Shift+X apart
+        if Modifier.CTRL in modifiers:
+            last = last.lower()
+
+        return KeyEvent(None, modifiers, last)
+
+    try:
+        return KeyEvent(_KEY_NAMES[last.lower()], modifiers)
+    except KeyError:
+        raise ValueError(f"unknown key {last!r} in {spec!r}")
+
+
+class Bindings:
+    """
+    Dispatches key events to handlers bound to key sequences.
+
+    Bindings are compiled into a prefix tree, so dispatching an event is a
+    single lookup regardless of the number of bindings.
+
+    When a key that starts a longer sequence is pressed, the following keys
+    have to be pressed within *chord_timeout*. If the sequence is not
+    continued in time, a handler bound to the keys pressed so far is called, if
+    any. The timeout is a timer on the event loop, not a task.
+
+    Args:
+        chord_timeout: Seconds to wait for the next key in a sequence or
+            ``None`` to wait forever.
+
+    Example::
+
+        bindings = Bindings()
+        bindings.bind("Ctrl-X Ctrl-S", save)
+        bindings.bind("g g", go_to_top)
+
+        async for code in parse(read_chars()):
+            event = key_event(code)
+
+            if not bindings.feed(event):
+                ...
+    """
+
+    def __init__(self, chord_timeout: float | None = 1.0) -> None:
+        self.chord_timeout = chord_timeout
+        self._root: _Node = {}
+        self._node = self._root
+        self._timer: asyncio.TimerHandle | None = None
+
+    def bind(
+        self,
+        keys: str | typing.Sequence[KeyEvent],
+        handler: typing.Callable[[], typing.Any],
+    ) -> None:
+        """
+        Binds a key sequence to a handler.
+
+        Binding the same sequence again replaces the previous handler.
+
+        Args:
+            keys: Space separated keys, e.g. ``"Ctrl-X Ctrl-S"`` (see
+                :func:`parse_key`) or a sequence of key events.
+            handler: Called with no arguments when the keys are pressed.
+
+        Raises:
+            ValueError: if *keys* is empty or contains an invalid key
+        """
+        if isinstance(keys, str):
+            keys = [parse_key(spec) for spec in keys.split()]
+
+        if not keys:
+            raise ValueError("no keys")
+
+        node = self._root
+
+        for event in keys:
+            node = node.setdefault(_lookup_key(event), {})
+
+        node[None] = handler
+
+    @property
+    def pending(self) -> bool:
+        """
+        ``True`` if part of a key sequence has been pressed.
+        """
+        return self._node is not self._root
+
+    def feed(self, event: KeyEvent | None) -> bool:
+        """
+        Handles a key event.
+
+        Args:
+            event: The key event, e.g. from :func:`aioterminal.keys.key_event`.
+
+        Returns:
+            ``True`` if the event was part of a bound key sequence, otherwise
+            ``False`` and the event should be handled as usual.
+        """
+        if event is None:
+            return False
+
+        child = self._node.get(_lookup_key(event))
+
+        if child is None:
+            if self._node is self._root:
+                return False
+
+            # the sequence was not continued
+            handler = self._node.get(None)
+            self.reset()
+
+            if handler is not None:
+                handler()
+
+            return self.feed(event)
+
+        if len(child) == 1 and None in child:
+            self.reset()
+            child[None]()
+            return True
+
+        self._node = child
+        self._cancel_timer()
+
+        if self.chord_timeout is not None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.chord_timeout, self._on_timeout
+            )
+
+        return True
+
+    def reset(self) -> None:
+        """
+        Forgets a partially pressed key sequence without calling any handler.
+        """
+        self._cancel_timer()
+        self._node = self._root
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_timeout(self) -> None:
+        self._timer = None
+        handler = self._node.get(None)
+        self._node = self._root
+
+        if handler is not None:
+            handler()
@@ -285,7 +285,32 @@ class C1(enum.IntEnum):
     """
 
 
-@dataclasses.dataclass
+_ENCODE_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=_ENCODE_CACHE_SIZE)
+def _encode(code: ESC | SS2 | SS3 | CSI, eight_bit: bool) -> bytes:
+    if isinstance(code, ESC):
+        # there is no 8-bit form
+        return ("\x1b" + code.char).encode("ascii")
+
+    if isinstance(code, CSI):
+        introducer = C1.CSI if eight_bit else "\x1b["
+        body = code.private + code.params + code.intermediate + code.final
+    elif isinstance(code, SS2):
+        introducer = C1.SS2 if eight_bit else "\x1bN"
+        body = code.char
+    else:
+        introducer = C1.SS3 if eight_bit else "\x1bO"
+        body = code.char
+
+    if eight_bit:
+        return bytes([introducer]) + body.encode("ascii")
+
+    return (introducer + body).encode("ascii")
+
+
+@dataclasses.dataclass(frozen=True)
 class SS2:
     """
     Single-shift 2.
@@ -293,8 +318,21 @@ class SS2:
 
     char: str
 
+    def encode(self, eight_bit: bool = False) -> bytes:
+        """
+        Encodes the control sequence as bytes.
+
+        Args:
+            eight_bit: If ``True``, use the 8-bit C1 control character instead
+                of the 7-bit ``ESC N`` form.
+        """
+        return _encode(self, eight_bit)
+
+    def __bytes__(self) -> bytes:
+        return _encode(self, False)
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(frozen=True)
 class SS3:
     """
     Single-shift 3.
@@ -302,6 +340,42 @@ class SS3:
 
     char: str
 
+    def encode(self, eight_bit: bool = False) -> bytes:
+        """
+        Encodes the control sequence as bytes.
+
+        Args:
+            eight_bit: If ``True``, use the 8-bit C1 control character instead
+                of the 7-bit ``ESC O`` form.
+        """
+        return _encode(self, eight_bit)
+
+    def __bytes__(self) -> bytes:
+        return _encode(self, False)
+
+
+@dataclasses.dataclass(frozen=True)
+class ESC:
+    """
+    Escape sequence without intermediate characters, e.g. ``ESC 7``.
+
+    In terminal input, this is usually a key pressed with Alt.
+    """
+
+    char: str
+
+    def encode(self, eight_bit: bool = False) -> bytes:
+        """
+        Encodes the control sequence as bytes.
+
+        Args:
+            eight_bit: Ignored since there is no 8-bit form.
+        """
+        return _encode(self, eight_bit)
+
+    def __bytes__(self) -> bytes:
+        return _encode(self, False)
+
 
 _CSI_NAME_LOOKUP: dict[tuple, str] = {}
 
@@ -339,6 +413,22 @@ class CSI:
     def name(self) -> str | None:
         return _CSI_NAME_LOOKUP.get((self.private, self.intermediate, self.final))
 
+    def encode(self, eight_bit: bool = False) -> bytes:
+        """
+        Encodes the control sequence as bytes.
+
+        Recently used sequences are cached, so encoding common sequences
+        like cursor movement repeatedly is cheap.
+
+        Args:
+            eight_bit: If ``True``, use the 8-bit C1 control character instead
+                of the 7-bit ``ESC [`` form.
+        """
+        return _encode(self, eight_bit)
+
+    def __bytes__(self) -> bytes:
+        return _encode(self, False)
+
     @staticmethod
     @_csi("", ["Ps"], "", "@")
     def ICH(n: int = None) -> CSI:
@@ -2293,6 +2383,65 @@ class CSI:
         """
 
 
+class SequenceBuffer:
+    """
+    Buffer for building output from control sequences and text.
+
+    Everything is appended to a single :class:`bytearray`, so a whole frame
+    can be written with a single system call.
+
+    Args:
+        eight_bit: If ``True``, use 8-bit C1 control characters.
+        encoding: The encoding used for text.
+
+    Example::
+
+        buf = SequenceBuffer()
+        buf.append(CSI.CUP(1, 1), CSI.SGR(1), "hello", CSI.SGR())
+        os.write(fd, buf.getbuffer())
+        buf.clear()
+    """
+
+    def __init__(self, eight_bit: bool = False, encoding: str = "utf-8") -> None:
+        self._buf = bytearray()
+        self._eight_bit = eight_bit
+        self._encoding = encoding
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self._buf)
+
+    def append(self, *items: SS2 | SS3 | CSI | str | bytes) -> None:
+        """
+        Appends control sequences, text or already encoded bytes.
+        """
+        buf = self._buf
+
+        for item in items:
+            if isinstance(item, str):
+                buf += item.encode(self._encoding)
+            elif isinstance(item, (bytes, bytearray, memoryview)):
+                buf += item
+            else:
+                buf += _encode(item, self._eight_bit)
+
+    def getbuffer(self) -> memoryview:
+        """
+        Gets a view of the buffer without copying.
+
+        The buffer can't be appended to or cleared until the view is released.
+        """
+        return memoryview(self._buf)
+
+    def clear(self) -> None:
+        """
+        Empties the buffer.
+        """
+        self._buf.clear()
+
+
 class _DCS(enum.Enum):
     SIXEL = enum.auto()
     """
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import enum
+import functools
+import typing
+
+if typing.TYPE_CHECKING:
+    import numpy
+
+
+class ColorMode(enum.Enum):
+    """
+    Color capability of a terminal.
+    """
+
+    TRUECOLOR = enum.auto()
+    """
+    24-bit RGB colors.
+    """
+    XTERM_256 = enum.auto()
+    """
+    xterm 256-color palette.
+    """
+    XTERM_16 = enum.auto()
+    """
+    The 8 standard colors plus the 8 bright colors.
+    """
+
+
+_PALETTE_16 = [
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+]
+"""
+Default xterm colors for the 16-color palette.
+"""
+
+_CUBE_LEVELS = [0, 95, 135, 175, 215, 255]
+"""
+Channel values of the 6x6x6 color cube (colors 16 to 231).
+"""
+
+_GRAY_LEVELS = [8 + 10 * i for i in range(24)]
+"""
+Values of the grayscale ramp (colors 232 to 255).
+"""
+
+_BITS = 5
+"""
+Number of bits per channel used to index the lookup tables.
+"""
+
+
+def _distance(a: tuple[int, int, int], b: tuple[int, int, int]) -> int:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+def _nearest(values: list[int], v: int) -> int:
+    return min(range(len(values)), key=lambda i: abs(values[i] - v))
+
+
+def _nearest_256(rgb: tuple[int, int, int]) -> int:
+    # The cube is separable, so the nearest cube color can be found one
+    # channel at a time. The 16 system colors are skipped since they are
+    # often changed by color themes.
+    r, g, b = (_nearest(_CUBE_LEVELS, c) for c in rgb)
+    cube = (_CUBE_LEVELS[r], _CUBE_LEVELS[g], _CUBE_LEVELS[b])
+    gray = _nearest(_GRAY_LEVELS, sum(rgb) // 3)
+
+    if _distance(rgb, (_GRAY_LEVELS[gray],) * 3) < _distance(rgb, cube):
+        return 232 + gray
+
+    return 16 + 36 * r + 6 * g + b
+
+
+def _nearest_16(rgb: tuple[int, int, int]) -> int:
+    return min(range(16), key=lambda i: _distance(rgb, _PALETTE_16[i]))
+
+
+def _table_centers() -> typing.Iterator[tuple[int, int, int]]:
+    step = 1 << (8 - _BITS)
+    centers = [i * step + step // 2 for i in range(1 << _BITS)]
+
+    for r in centers:
+        for g in centers:
+            for b in centers:
+                yield r, g, b
+
+
+@functools.cache
+def _table(mode: ColorMode) -> bytes:
+    """
+    Gets a lookup table indexed by :func:`_index` of the nearest palette color.
+
+    Tables are computed on first use.
+    """
+    nearest = _nearest_256 if mode == ColorMode.XTERM_256 else _nearest_16
+    return bytes(nearest(rgb) for rgb in _table_centers())
+
+
+def _index(r: int, g: int, b: int) -> int:
+    shift = 8 - _BITS
+    return (r >> shift) << (2 * _BITS) | (g >> shift) << _BITS | b >> shift
+
+
+def to_256(r: int, g: int, b: int) -> int:
+    """
+    Gets the nearest color in the xterm 256-color palette.
+
+    Args:
+        r: Red value 0 to 255.
+        g: Green value 0 to 255.
+        b: Blue value 0 to 255.
+
+    Returns:
+        The palette index.
+    """
+    return _table(ColorMode.XTERM_256)[_index(r, g, b)]
+
+
+def to_16(r: int, g: int, b: int) -> int:
+    """
+    Gets the nearest color in the 16-color palette.
+
+    Args:
+        r: Red value 0 to 255.
+        g: Green value 0 to 255.
+        b: Blue value 0 to 255.
+
+    Returns:
+        The palette index.
+    """
+    return _table(ColorMode.XTERM_16)[_index(r, g, b)]
+
+
+def _params(base: int, r: int, g: int, b: int, mode: ColorMode) -> tuple[int, ...]:
+    if mode == ColorMode.TRUECOLOR:
+        return (base + 8, 2, r, g, b)
+
+    if mode == ColorMode.XTERM_256:
+        return (base + 8, 5, to_256(r, g, b))
+
+    n = to_16(r, g, b)
+
+    return (base + n,) if n < 8 else (base + 60 + n - 8,)
+
+
+def foreground(
+    r: int, g: int, b: int, mode: ColorMode = ColorMode.TRUECOLOR
+) -> tuple[int, ...]:
+    """
+    Gets :meth:`CSI.SGR` parameters to set the foreground color.
+
+    Args:
+        r: Red value 0 to 255.
+        g: Green value 0 to 255.
+        b: Blue value 0 to 255.
+        mode: The color capability of the terminal. The color is converted to
+            the nearest color in the palette if needed.
+
+    Example::
+
+        CSI.SGR(*foreground(255, 128, 0, ColorMode.XTERM_256))
+    """
+    return _params(30, r, g, b, mode)
+
+
+def background(
+    r: int, g: int, b: int, mode: ColorMode = ColorMode.TRUECOLOR
+) -> tuple[int, ...]:
+    """
+    Gets :meth:`CSI.SGR` parameters to set the background color.
+
+    Args:
+        r: Red value 0 to 255.
+        g: Green value 0 to 255.
+        b: Blue value 0 to 255.
+        mode: The color capability of the terminal. The color is converted to
+            the nearest color in the palette if needed.
+    """
+    return _params(40, r, g, b, mode)
+
+
+def quantize(pixels: numpy.ndarray, mode: ColorMode) -> numpy.ndarray:
+    """
+    Converts many colors at once to palette indexes.
+
+    Requires NumPy.
+
+    Args:
+        pixels: Array of ``uint8`` with RGB in the last dimension, e.g. an image
+            with shape ``(height, width, 3)``.
+        mode: :attr:`ColorMode.XTERM_256` or :attr:`ColorMode.XTERM_16`.
+
+    Returns:
+        Array of ``uint8`` palette indexes with the shape of *pixels* without
+        the last dimension.
+    """
+    import numpy
+
+    if mode == ColorMode.TRUECOLOR:
+        raise ValueError("mode must be a palette mode")
+
+    table = numpy.frombuffer(_table(mode), dtype=numpy.uint8)
+    pixels = numpy.asarray(pixels, dtype=numpy.uint8) >> (8 - _BITS)
+    index = (
+        pixels[..., 0].astype(numpy.intp) << (2 * _BITS)
+        | pixels[..., 1].astype(numpy.intp) << _BITS
+        | pixels[..., 2]
+    )
+
+    return table[index]
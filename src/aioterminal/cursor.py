@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import functools
+
+from .codes import CSI
+
+# Positions are 0-based (row, column) tuples, or None if the cursor position
+# is not known.
+
+
+def _n(n: int) -> int | None:
+    # the parameter can be omitted when it is the default value of 1
+    return None if n == 1 else n
+
+
+def _cup(row: int, column: int) -> bytes:
+    # trailing parameters can be omitted when they are the default value
+    if column == 0:
+        return CSI.CUP(_n(row + 1)).encode()
+
+    return CSI.CUP(row + 1, column + 1).encode()
+
+
+def _horizontal(start: int, end: int) -> list[bytes]:
+    """
+    Gets the ways to move from column *start* to column *end* in the same row.
+    """
+    if start == end:
+        return [b""]
+
+    # carriage return then move forward from the first column
+    cr = b"\r" + (CSI.CUF(_n(end)).encode() if end else b"")
+    absolute = CSI.CHA(_n(end + 1)).encode()
+
+    if end > start:
+        return [CSI.CUF(_n(end - start)).encode(), absolute, cr]
+
+    return [CSI.CUB(_n(start - end)).encode(), b"\b" * (start - end), absolute, cr]
+
+
+def _vertical(start: int, end: int) -> list[bytes]:
+    """
+    Gets the ways to move from row *start* to row *end* in the same column.
+    """
+    if start == end:
+        return [b""]
+
+    absolute = CSI.VPA(_n(end + 1)).encode()
+
+    if end > start:
+        return [CSI.CUD(_n(end - start)).encode(), absolute]
+
+    return [CSI.CUU(_n(start - end)).encode(), absolute]
+
+
+@functools.lru_cache(maxsize=4096)
+def _plan(start: tuple[int, int] | None, end: tuple[int, int]) -> bytes:
+    if start == end:
+        return b""
+
+    row, column = end
+    candidates = [_cup(row, column)]
+
+    if start is None:
+        return candidates[0]
+
+    start_row, start_column = start
+
+    for v in _vertical(start_row, row):
+        for h in _horizontal(start_column, column):
+            candidates.append(v + h)
+
+    if row > start_row:
+        # NB: "\n" may or may not return to the first column, depending on
+        # the terminal settings, so always start with "\r".
+        lines = b"\r" + b"\n" * (row - start_row)
+
+        for h in _horizontal(0, column):
+            candidates.append(lines + h)
+
+    return min(candidates, key=len)
+
+
+def move(
+    start: tuple[int, int] | None,
+    end: tuple[int, int],
+    reprint: str | None = None,
+) -> bytes:
+    """
+    Gets the shortest sequence to move the cursor.
+
+    This chooses between absolute and relative cursor movement control
+    sequences, carriage return, line feed and backspace. Results are cached.
+
+    Args:
+        start: The 0-based ``(row, column)`` of the cursor or ``None`` if the
+            position is not known.
+        end: The 0-based ``(row, column)`` to move the cursor to. This must be
+            on the screen.
+        reprint: If *end* is after *start* in the same row and it is known
+            what is already displayed in between, that text. It will be used
+            if printing it again is shorter than moving the cursor. The caller
+            is responsible for making sure the current character attributes
+            match this text.
+
+    Returns:
+        The encoded control characters.
+    """
+    planned = _plan(start, end)
+
+    if reprint is not None and len(planned) > len(reprint):
+        encoded = reprint.encode()
+
+        if len(encoded) < len(planned):
+            return encoded
+
+    return planned
@@ -1,6 +1,11 @@
+from __future__ import annotations
+
+import dataclasses
 import enum
+import re
+import typing
 
-from .codes import CSI, SS3
+from .codes import CSI, ESC, SS3
 
 
 class Key(enum.Enum):
@@ -42,120 +47,254 @@ class Key(enum.Enum):
     BACKSPACE = enum.auto()
 
 
-def code_to_key(code: int | str | SS3 | CSI) -> Key | None:
-    match code:
-        case str(s):
-            match s:
-                case "\r":
-                    return Key.ENTER
-                case "\t":
-                    return Key.TAB
-                case "\x1b":
-                    return Key.ESCAPE
-                case " ":
-                    return Key.SPACE
-                case "\x7f":
-                    return Key.BACKSPACE
-                case _:
-                    return None
-
-        case CSI(private, params, intermediates, final):
-            if not private and not intermediates:
-                match final:
-                    case "A":
-                        return Key.UP_ARROW
-                    case "B":
-                        return Key.DOWN_ARROW
-                    case "C":
-                        return Key.RIGHT_ARROW
-                    case "D":
-                        return Key.LEFT_ARROW
-                    case "E":
-                        return Key.BEGIN
-                    case "F":
-                        return Key.END
-                    case "H":
-                        return Key.HOME
-                    case "~":
-                        match params:
-                            case "1":
-                                return Key.HOME
-                            case "2":
-                                return Key.INSERT
-                            case "3":
-                                return Key.DELETE
-                            case "4":
-                                return Key.END
-                            case "5":
-                                return Key.PAGE_UP
-                            case "6":
-                                return Key.PAGE_DOWN
-                            case "15":
-                                return Key.F5
-                            case "17":
-                                return Key.F6
-                            case "18":
-                                return Key.F7
-                            case "19":
-                                return Key.F8
-                            case "20":
-                                return Key.F9
-                            case "21":
-                                return Key.F10
-                            case "23":
-                                return Key.F11
-                            case "24":
-                                return Key.F12
-                            case "25":
-                                return Key.F13
-                            case "26":
-                                return Key.F14
-                            case "28":
-                                return Key.F15
-                            case "29":
-                                return Key.F16
-                            case "31":
-                                return Key.F17
-                            case "32":
-                                return Key.F18
-                            case "33":
-                                return Key.F19
-                            case "34":
-                                return Key.F20
-                            case _:
-                                return None
-                    case _:
-                        return None
-        case SS3(char):
-            match char:
-                case " ":
-                    return Key.SPACE
-
-                case "A":
-                    return Key.UP_ARROW
-                case "B":
-                    return Key.DOWN_ARROW
-                case "C":
-                    return Key.RIGHT_ARROW
-                case "D":
-                    return Key.LEFT_ARROW
-                case "F":
-                    return Key.END
-                case "H":
-                    return Key.HOME
-                case "I":
-                    return Key.TAB
-                case "M":
-                    return Key.ENTER
-                case "P":
-                    return Key.F1
-                case "Q":
-                    return Key.F2
-                case "R":
-                    return Key.F3
-                case "S":
-                    return Key.F4
-                case _:
-                    return None
-        case _:
-            return None
+class Modifier(enum.IntFlag):
+    """
+    Modifier keys held down while pressing a key.
+
+    The values match the bits of the xterm modifier parameter.
+    """
+
+    NONE = 0
+    SHIFT = 1
+    ALT = 2
+    CTRL = 4
+    META = 8
+
+
+_CHAR_KEYS = {
+    "\r": Key.ENTER,
+    # Enter when the terminal translates CR to NL (ICRNL)
+    "\n": Key.ENTER,
+    "\t": Key.TAB,
+    "\x1b": Key.ESCAPE,
+    " ": Key.SPACE,
+    "\x7f": Key.BACKSPACE,
+}
+
+_SS3_KEYS = {
+    " ": Key.SPACE,
+    "A": Key.UP_ARROW,
+    "B": Key.DOWN_ARROW,
+    "C": Key.RIGHT_ARROW,
+    "D": Key.LEFT_ARROW,
+    "F": Key.END,
+    "H": Key.HOME,
+    "I": Key.TAB,
+    "M": Key.ENTER,
+    "P": Key.F1,
+    "Q": Key.F2,
+    "R": Key.F3,
+    "S": Key.F4,
+}
+
+_CSI_FINAL_KEYS = {
+    "A": Key.UP_ARROW,
+    "B": Key.DOWN_ARROW,
+    "C": Key.RIGHT_ARROW,
+    "D": Key.LEFT_ARROW,
+    "E": Key.BEGIN,
+    "F": Key.END,
+    "H": Key.HOME,
+    # xterm sends these with modifiers, e.g. CSI 1 ; 5 P for Ctrl+F1
+    "P": Key.F1,
+    "Q": Key.F2,
+    "R": Key.F3,
+    "S": Key.F4,
+}
+
+_CSI_TILDE_KEYS = {
+    "1": Key.HOME,
+    "2": Key.INSERT,
+    "3": Key.DELETE,
+    "4": Key.END,
+    "5": Key.PAGE_UP,
+    "6": Key.PAGE_DOWN,
+    "15": Key.F5,
+    "17": Key.F6,
+    "18": Key.F7,
+    "19": Key.F8,
+    "20": Key.F9,
+    "21": Key.F10,
+    "23": Key.F11,
+    "24": Key.F12,
+    "25": Key.F13,
+    "26": Key.F14,
+    "28": Key.F15,
+    "29": Key.F16,
+    "31": Key.F17,
+    "32": Key.F18,
+    "33": Key.F19,
+    "34": Key.F20,
+}
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class KeyEvent:
+    """
+    A key press.
+
+    Instances returned by :func:`key_event` for keys and single characters are
+    interned, so repeated key presses don't allocate and can be compared with
+    ``is``.
+
+    Example::
+
+        match key_event(code):
+            case KeyEvent(Key.UP_ARROW, Modifier.NONE):
+                ...
+            case KeyEvent(None, Modifier.NONE, "q"):
+                ...
+    """
+
+    key: Key | None
+    """
+    The key or ``None`` for printable text without a :class:`Key`.
+    """
+    modifiers: Modifier = Modifier.NONE
+    """
+    Modifier keys held down.
+    """
+    text: str = ""
+    """
+    The text that was typed, if any. For control characters typed with
+    :attr:`Modifier.CTRL`, this is the letter or symbol of the key, e.g.
+    ``"x"`` for Ctrl+X.
+    """
+
+
+_events: dict[tuple[Key | None, int, str], KeyEvent] = {}
+"""
+Interned results of :func:`key_event`.
+"""
+
+
+def _intern(key: Key | None, modifiers: int = 0, text: str = "") -> KeyEvent:
+    try:
+        return _events[key, modifiers, text]
+    except KeyError:
+        event = KeyEvent(key, Modifier(modifiers), text)
+        return _events.setdefault((key, modifiers, text), event)
+
+
+_CHAR_LOOKUP = {char: _intern(key, 0, char) for char, key in _CHAR_KEYS.items()}
+
+_CTRL_LOOKUP = {
+    # other C0 control characters are typed with Ctrl, e.g. Ctrl+X is 0x18
+    **{
+        chr(c): _intern(None, Modifier.CTRL, chr(c + 0x60 if c <= 0x1A else c + 0x40))
+        for c in range(0x01, 0x20)
+    },
+    "\x00": _intern(Key.SPACE, Modifier.CTRL),
+}
+"""
+Lowest priority lookup for control characters, so that e.g. ``kbs=^H`` from
+terminfo takes precedence over Ctrl+H.
+"""
+
+_SS3_LOOKUP = {char: _intern(key) for char, key in _SS3_KEYS.items()}
+
+_CSI_LOOKUP = {
+    # (private, intermediate, final, first parameter)
+    **{("", "", f, "1"): _intern(k) for f, k in _CSI_FINAL_KEYS.items()},
+    **{("", "", f, ""): _intern(k) for f, k in _CSI_FINAL_KEYS.items()},
+    **{("", "", "~", p): _intern(k) for p, k in _CSI_TILDE_KEYS.items()},
+    # back tab
+    ("", "", "Z", ""): _intern(Key.TAB, Modifier.SHIFT),
+}
+
+_CONTROL = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+
+def key_event(
+    code: int | str | ESC | SS3 | CSI,
+    fallback: typing.Mapping[typing.Any, KeyEvent] | None = None,
+) -> KeyEvent | None:
+    """
+    Gets the key event for a code from the parser.
+
+    Modifiers are decoded from the xterm modifier parameter, e.g. ``CSI 1 ; 5 A``
+    is :attr:`Key.UP_ARROW` with :attr:`Modifier.CTRL`, and ``ESC x`` is the
+    key pressed with :attr:`Modifier.ALT`. Printable text that isn't a
+    :class:`Key` gives an event with only :attr:`KeyEvent.text`.
+
+    Args:
+        code: An item from :func:`aioterminal.parser.parse`.
+        fallback: Lookup for codes that aren't known xterm keys, e.g. from
+            :func:`aioterminal.terminfo.load_keys`.
+
+    Returns:
+        The key event or ``None`` if *code* is not a known key.
+    """
+    event = _decode(code)
+
+    if event is None and fallback:
+        event = fallback.get(code)
+
+    if event is None and isinstance(code, str):
+        event = _CTRL_LOOKUP.get(code)
+
+    return event
+
+
+def _decode(code: int | str | ESC | SS3 | CSI) -> KeyEvent | None:
+    if isinstance(code, str):
+        event = _CHAR_LOOKUP.get(code)
+
+        if event is not None or not code or _CONTROL.search(code):
+            return event
+
+        if len(code) == 1:
+            return _intern(None, 0, code)
+
+        # text runs aren't interned
+        return KeyEvent(None, Modifier.NONE, code)
+
+    if isinstance(code, CSI):
+        param0, _, rest = code.params.partition(";")
+        event = _CSI_LOOKUP.get((code.private, code.intermediate, code.final, param0))
+
+        if event is None or not rest:
+            return event
+
+        # the parameter is 1 + modifier bits, possibly followed by
+        # sub-parameters, e.g. 5:1 for the press event from the kitty protocol
+        param1 = rest.partition(";")[0].partition(":")[0]
+
+        if not param1.isdigit():
+            return event
+
+        modifiers = int(param1) - 1
+
+        if not 0 < modifiers <= 0xF:
+            return event
+
+        return _intern(event.key, modifiers | event.modifiers)
+
+    if isinstance(code, SS3):
+        return _SS3_LOOKUP.get(code.char)
+
+    if isinstance(code, ESC):
+        # e.g. Alt+x sends ESC x
+        event = _CHAR_LOOKUP.get(code.char) or _CTRL_LOOKUP.get(code.char)
+
+        if event is None:
+            return _intern(None, Modifier.ALT, code.char)
+
+        return _intern(event.key, event.modifiers | Modifier.ALT, event.text)
+
+    return None
+
+
+def code_to_key(code: int | str | ESC | SS3 | CSI) -> Key | None:
+    """
+    Gets the key for a code from the parser, ignoring modifiers.
+
+    Args:
+        code: An item from :func:`aioterminal.parser.parse`.
+
+    Returns:
+        The key or ``None`` if *code* is not a known key.
+    """
+    event = key_event(code)
+
+    return None if event is None else event.key
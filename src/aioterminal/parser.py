@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import dataclasses
-import itertools
+import enum
+import re
 import typing
 
-from .codes import CSI, SS2, SS3
+from .codes import CSI, ESC, SS2, SS3
 
 # state machine based on info from https://www.vt100.net/emu/dec_ansi_parser
 
@@ -55,6 +57,10 @@ class Action:
 
     @staticmethod
     def esc_dispatch(code: int, context: _Context):
+        if context.intermediate_chars:
+            # e.g. character set designation
+            return
+
         if code == 0x4E:  # 'N'
             context.single_shift = 2
             return
@@ -63,7 +69,11 @@ class Action:
             context.single_shift = 3
             return
 
-        ...
+        if code == 0x5C:  # '\\'
+            # string terminator, e.g. at the end of a DCS reply
+            return
+
+        return ESC(chr(code))
 
     @staticmethod
     def csi_dispatch(code: int, context: _Context):
@@ -101,477 +111,369 @@ class Action:
         ...
 
 
-_ENTRY_ATTR = "entry"
-_EXIT_ATTR = "exit"
-
-
-def _entry(action):
-    def decorator(target):
-        setattr(target, _ENTRY_ATTR, action)
-        return target
-
-    return decorator
-
-
-def _exit(action):
-    def decorator(target):
-        setattr(target, _EXIT_ATTR, action)
-        return target
-
-    return decorator
-
-
-class State:
-    @staticmethod
-    def ground(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.print(code, context)
-
-        if 0x20 <= code <= 0x7F or code > 0xFF:  # SP to '~' or unicode
-            return Action.print(code, context)
-
-    @staticmethod
-    @_entry(Action.clear)
-    def escape(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.execute(code, context)
-
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.escape_intermediate, context)
-            return ret
-
-        if code == 0x50:  # 'P'
-            _change_state(State.dcs_entry, context)
-            return
-
-        if code == 0x58 or code == 0x5E or code == 0x5F:  # 'X', '^', '_'
-            _change_state(State.sos_pm_apc_string, context)
-            return
-
-        if code == 0x5B:  # '['
-            _change_state(State.csi_entry, context)
-            return
-
-        if code == 0x5D:  # ']'
-            _change_state(State.osc_string, context)
-            return
-
-        if 0x30 <= code <= 0x7E:  # '0' to '~'
-            # these should handled above
-            assert code != 0x50  # 'P'
-            assert code != 0x58  # 'X'
-            assert code != 0x5B  # '['
-            assert code != 0x5D  # ]'
-            assert code != 0x5E  # '^'
-            assert code != 0x5F  # '_'
-
-            ret = Action.esc_dispatch(code, context)
-            _change_state(State.ground, context)
-            return ret
-
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
-
-    @staticmethod
-    def escape_intermediate(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.execute(code, context)
-
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.csi_intermediate, context)
-            return ret
-
-        if 0x30 <= code <= 0x7E:  # '0' to '~'
-            return Action.esc_dispatch(code, context)
-
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
-
-    @staticmethod
-    @_entry(Action.clear)
-    def csi_entry(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.execute(code, context)
-
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.csi_intermediate, context)
-            return ret
-
-        if code == 0x3A:  # ':'
-            _change_state(State.csi_ignore, context)
-            return
-
-        if 0x30 <= code <= 0x3F:  # '0' to '?'
-            # handled above
-            assert code != 0x3A  # ':'
-
-            if code < 0x3C:  # '0' to '9', ';'
-                ret = Action.param(code, context)
-            else:
-                ret = Action.collect(code, context)
-
-            _change_state(State.csi_param, context)
-            return ret
-
-        if 0x40 <= code <= 0x7E:  # '@' to '~'
-            ret = Action.csi_dispatch(code, context)
-            _change_state(State.ground, context)
-            return ret
-
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
-
-    @staticmethod
-    def csi_param(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.execute(code, context)
-
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.csi_intermediate, context)
-            return ret
-
-        if 0x30 <= code <= 0x39 or code == 0x3B:  # '0' to '9', ';'
-            return Action.param(code, context)
-
-        if code == 0x3A or 0x3C <= code <= 0x3F:  # ':', '<' to '?'
-            _change_state(State.csi_ignore, context)
-            return
-
-        if 0x40 <= code <= 0x7E:  # '@' to '~'
-            ret = Action.csi_dispatch(code, context)
-            _change_state(State.ground, context)
-            return ret
-
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
-
-    @staticmethod
-    def csi_intermediate(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.execute(code, context)
-
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.csi_intermediate, context)
-            return ret
-
-        if 0x30 <= code <= 0x3F:  # '0' to '?'
-            _change_state(State.csi_ignore, context)
-            return
+class State(enum.IntEnum):
+    GROUND = 0
+    ESCAPE = enum.auto()
+    ESCAPE_INTERMEDIATE = enum.auto()
+    CSI_ENTRY = enum.auto()
+    CSI_PARAM = enum.auto()
+    CSI_INTERMEDIATE = enum.auto()
+    CSI_IGNORE = enum.auto()
+    DCS_ENTRY = enum.auto()
+    DCS_PARAM = enum.auto()
+    DCS_INTERMEDIATE = enum.auto()
+    DCS_PASSTHROUGH = enum.auto()
+    DCS_IGNORE = enum.auto()
+    OSC_STRING = enum.auto()
+    SOS_PM_APC_STRING = enum.auto()
+
+
+_ENTRY: dict[State, callable] = {
+    State.ESCAPE: Action.clear,
+    State.CSI_ENTRY: Action.clear,
+    State.DCS_ENTRY: Action.clear,
+    State.DCS_PASSTHROUGH: Action.hook,
+    State.OSC_STRING: Action.osc_start,
+}
+
+_EXIT: dict[State, callable] = {
+    State.DCS_PASSTHROUGH: Action.unhook,
+    State.OSC_STRING: Action.osc_end,
+}
+
+_OTHER = 0xA0
+"""
+Column of the transition table shared by all code points >= 0xA0.
+"""
+
+_Transition = tuple[
+    typing.Callable | None, typing.Callable | None, typing.Callable | None, State | None
+]
+"""
+``(action, exit, entry, next_state)`` where everything except *action* is
+``None`` if the code does not cause a state change.
+"""
+
+_NO_OP: _Transition = (None, None, None, None)
+
+_TABLE: list[list[_Transition]] = [[_NO_OP] * (_OTHER + 1) for _ in State]
+
+
+def _on(
+    state: State,
+    codes: typing.Iterable[int],
+    action: callable | None,
+    next_state: State | None = None,
+) -> None:
+    if next_state is None:
+        transition = (action, None, None, None)
+    else:
+        transition = (action, _EXIT.get(state), _ENTRY.get(next_state), next_state)
+
+    for code in codes:
+        _TABLE[state][code] = transition
+
+
+# C0 control chars that are not handled by the "anywhere" transitions
+_C0 = [*range(0x00, 0x18), 0x19, *range(0x1C, 0x20)]
+
+_on(State.GROUND, _C0, Action.print)
+_on(State.GROUND, range(0x20, 0x80), Action.print)  # SP to DEL
+_on(State.GROUND, [_OTHER], Action.print)  # unicode
+
+# not in the DEC state machine, but in terminal input ESC followed by a control
+# char is Alt with that key, e.g. Alt+Enter
+_on(State.ESCAPE, _C0, Action.esc_dispatch, State.GROUND)
+_on(State.ESCAPE, range(0x20, 0x30), Action.collect, State.ESCAPE_INTERMEDIATE)
+_on(State.ESCAPE, range(0x30, 0x7F), Action.esc_dispatch, State.GROUND)
+# same for Alt+Backspace and Alt with non-ASCII chars
+_on(State.ESCAPE, [0x7F, _OTHER], Action.esc_dispatch, State.GROUND)
+_on(State.ESCAPE, [0x50], None, State.DCS_ENTRY)  # 'P'
+_on(State.ESCAPE, [0x58, 0x5E, 0x5F], None, State.SOS_PM_APC_STRING)  # 'X', '^', '_'
+_on(State.ESCAPE, [0x5B], None, State.CSI_ENTRY)  # '['
+_on(State.ESCAPE, [0x5D], None, State.OSC_STRING)  # ']'
+
+_on(State.ESCAPE_INTERMEDIATE, _C0, Action.execute)
+_on(State.ESCAPE_INTERMEDIATE, range(0x20, 0x30), Action.collect)
+_on(State.ESCAPE_INTERMEDIATE, range(0x30, 0x7F), Action.esc_dispatch, State.GROUND)
+
+_on(State.CSI_ENTRY, _C0, Action.execute)
+_on(State.CSI_ENTRY, range(0x20, 0x30), Action.collect, State.CSI_INTERMEDIATE)
+_on(State.CSI_ENTRY, [*range(0x30, 0x3A), 0x3B], Action.param, State.CSI_PARAM)
+_on(State.CSI_ENTRY, [0x3A], None, State.CSI_IGNORE)  # ':'
+_on(State.CSI_ENTRY, range(0x3C, 0x40), Action.collect, State.CSI_PARAM)  # '<' to '?'
+_on(State.CSI_ENTRY, range(0x40, 0x7F), Action.csi_dispatch, State.GROUND)
+
+_on(State.CSI_PARAM, _C0, Action.execute)
+_on(State.CSI_PARAM, range(0x20, 0x30), Action.collect, State.CSI_INTERMEDIATE)
+_on(State.CSI_PARAM, [*range(0x30, 0x3A), 0x3B], Action.param)
+_on(State.CSI_PARAM, [0x3A, *range(0x3C, 0x40)], None, State.CSI_IGNORE)
+_on(State.CSI_PARAM, range(0x40, 0x7F), Action.csi_dispatch, State.GROUND)
+
+_on(State.CSI_INTERMEDIATE, _C0, Action.execute)
+_on(State.CSI_INTERMEDIATE, range(0x20, 0x30), Action.collect)
+_on(State.CSI_INTERMEDIATE, range(0x30, 0x40), None, State.CSI_IGNORE)
+_on(State.CSI_INTERMEDIATE, range(0x40, 0x7F), Action.csi_dispatch, State.GROUND)
+
+_on(State.CSI_IGNORE, _C0, Action.execute)
+_on(State.CSI_IGNORE, range(0x40, 0x7F), None, State.GROUND)
+
+_on(State.DCS_ENTRY, range(0x20, 0x30), Action.collect, State.DCS_INTERMEDIATE)
+_on(State.DCS_ENTRY, [*range(0x30, 0x3A), 0x3B], Action.param, State.DCS_PARAM)
+_on(State.DCS_ENTRY, [0x3A], None, State.DCS_IGNORE)  # ':'
+_on(State.DCS_ENTRY, range(0x3C, 0x40), Action.collect, State.DCS_PARAM)  # '<' to '?'
+_on(State.DCS_ENTRY, range(0x40, 0x7F), None, State.DCS_PASSTHROUGH)
+
+_on(State.DCS_PARAM, range(0x20, 0x30), Action.collect, State.DCS_INTERMEDIATE)
+_on(State.DCS_PARAM, [*range(0x30, 0x3A), 0x3B], Action.param)
+_on(State.DCS_PARAM, [0x3A, *range(0x3C, 0x40)], None, State.DCS_IGNORE)
+_on(State.DCS_PARAM, range(0x40, 0x7F), None, State.DCS_PASSTHROUGH)
+
+_on(State.DCS_INTERMEDIATE, range(0x20, 0x30), Action.collect)
+_on(State.DCS_INTERMEDIATE, range(0x30, 0x40), None, State.DCS_IGNORE)
+_on(State.DCS_INTERMEDIATE, range(0x40, 0x7F), None, State.DCS_PASSTHROUGH)
+
+_on(State.DCS_PASSTHROUGH, [*_C0, *range(0x20, 0x7F)], Action.put)
+
+_on(State.OSC_STRING, range(0x20, 0x80), Action.osc_put)
+
+# transitions that apply to all states
+
+for _state in State:
+    _on(_state, [0x18, 0x1A], Action.execute, State.GROUND)  # CAN, SUB
+    _on(
+        _state,
+        [c for c in range(0x80, 0x9B) if c not in [0x90, 0x98]],
+        Action.execute,
+        State.GROUND,
+    )  # C1 control chars except DCS, SOS
+    _on(_state, [0x9C], None, State.GROUND)  # ST
+    _on(_state, [0x1B], None, State.ESCAPE)  # ESC
+    _on(_state, [0x9B], None, State.CSI_ENTRY)  # CSI
+    _on(_state, [0x90], None, State.DCS_ENTRY)  # DCS
+    _on(_state, [0x9D], None, State.OSC_STRING)  # OSC
+    _on(_state, [0x98, 0x9E, 0x9F], None, State.SOS_PM_APC_STRING)  # SOS, PM, APC
+
+del _state
 
-        if 0x40 <= code <= 0x7E:  # '@' to '~'
-            ret = Action.csi_dispatch(code, context)
-            _change_state(State.ground, context)
-            return ret
 
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
+@dataclasses.dataclass
+class _Context:
+    state: State = dataclasses.field(default=State.GROUND)
+    private_markers: list[int] = dataclasses.field(default_factory=list)
+    intermediate_chars: list[int] = dataclasses.field(default_factory=list)
+    final_char: int | None = dataclasses.field(default=None)
+    params: list[int] = dataclasses.field(default_factory=list)
+    single_shift: int = dataclasses.field(default=0)
 
-    @staticmethod
-    def csi_ignore(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
 
-            return Action.execute(code, context)
+def _advance(code: int, context: _Context) -> typing.Any:
+    """
+    Feeds a single code point to the state machine and returns the emitted
+    value, if any.
+    """
+    action, on_exit, on_entry, next_state = _TABLE[context.state][
+        code if code < _OTHER else _OTHER
+    ]
 
-        if 0x20 <= code <= 0x3F or code == 0x7F:  # SP to '?', DEL
-            return Action.ignore(code, context)
+    if on_exit is not None:
+        on_exit(context)
 
-        if 0x40 < -code <= 0x7E:  # '@' to '~'
-            _change_state(State.ground, context)
-            return
+    emit = None if action is None else action(code, context)
 
-    @staticmethod
-    @_entry(Action.clear)
-    def dcs_entry(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F or code == 0x7F:
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.ignore(code, context)
-
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.dcs_intermediate, context)
-            return ret
-
-        if code == 0x3A:  # ':'
-            _change_state(State.dcs_ignore, context)
-            return
+    if next_state is not None:
+        if on_entry is not None:
+            on_entry(context)
 
-        if 0x30 <= code <= 0x3F:  # '0' to '?'
-            # handled above
-            assert code != 0x3A  # ':'
+        context.state = next_state
 
-            if code < 0x3C:  # '0' to '9', ';'
-                ret = Action.param(code, context)
-            else:
-                ret = Action.collect(code, context)
+    return emit
 
-            _change_state(State.dcs_param, context)
-            return ret
 
-        if 0x40 <= code <= 0x7E:  # letters (and a few symbols)
-            _change_state(State.dcs_passthrough, context)
-            return
+_TEXT_RUN = re.compile(r"[^\x00-\x1f\x7f-\x9f]+")
+"""
+Matches a run of printable characters (no C0 or C1 controls and no DEL).
+"""
 
-    @staticmethod
-    def dcs_param(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
 
-            return Action.ignore(code, context)
+class Parser:
+    """
+    Synchronous, push-style parser.
 
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.dcs_intermediate, context)
-            return ret
+    This uses the same state machine as :func:`parse` but can be fed whole
+    chunks of text at a time and can be used without an event loop.
 
-        if 0x30 <= code <= 0x39 or code == 0x3B:  # '0' to '9', ';'
-            return Action.param(code, context)
+    Args:
+        text_runs: If ``True``, consecutive printable characters in the ground
+            state are emitted as a single string instead of one string per
+            character. Control characters are still emitted individually.
 
-        if code == 0x3A or 0x3C <= code <= 0x3F:  # ':', '<' to '?'
-            _change_state(State.dcs_ignore, context)
-            return
+    Example::
 
-        if 0x40 <= code <= 0x7E:  # '@' to '~'
-            _change_state(State.dcs_passthrough, context)
-            return
+        parser = Parser()
 
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
+        for event in parser.feed(chunk):
+            ...
 
-    @staticmethod
-    def dcs_intermediate(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.execute(code, context)
-
-        if 0x20 <= code <= 0x2F:  # SP to '/'
-            ret = Action.collect(code, context)
-            _change_state(State.csi_intermediate, context)
-            return ret
-
-        if 0x30 <= code <= 0x3F:  # '0' to '?'
-            _change_state(State.csi_ignore, context)
-            return
+        # if no more input is available
+        for event in parser.flush():
+            ...
+    """
 
-        if 0x40 <= code <= 0x7E:  # '@' to '~'
-            ret = Action.csi_dispatch(code, context)
-            _change_state(State.ground, context)
-            return ret
+    def __init__(self, text_runs: bool = False) -> None:
+        self._context = _Context()
+        self._text_runs = text_runs
 
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
+    @property
+    def pending_escape(self) -> bool:
+        """
+        ``True`` if the last code point fed to the parser was a lone escape
+        character that could either be the escape key or the start of an
+        escape sequence.
+        """
+        return self._context.state == State.ESCAPE
 
-    @staticmethod
-    @_entry(Action.hook)
-    @_exit(Action.unhook)
-    def dcs_passthrough(code: int, context: _Context):
-        if 0x00 <= code <= 0x7E:  # NULL to '~'
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.put(code, context)
-
-        if code == 0x7F:  # DEL
-            return Action.ignore(code, context)
-
-        if code == 0x9C:  # ST
-            _change_state(State.ground, context)
-            return
+    def feed(self, text: str) -> list[typing.Any]:
+        """
+        Feeds *text* to the parser.
 
-    @staticmethod
-    def dcs_ignore(code: int, context: _Context):
-        if 0x00 <= code <= 0x7F:  # NULL to '~'
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
+        Args:
+            text: Any number of characters, e.g. a chunk from a read.
 
-            return Action.ignore(code, context)
+        Returns:
+            The events parsed from *text* (and any previous incomplete sequence).
+        """
+        context = self._context
+        events = []
 
-    @staticmethod
-    @_entry(Action.osc_start)
-    @_exit(Action.osc_end)
-    def osc_string(code: int, context: _Context):
-        if 0x00 <= code <= 0x1F:  # NULL to US
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
-
-            return Action.ignore(code, context)
-
-        if 0x20 <= code <= 0x7F:  # SP to '~'
-            return Action.osc_put(code, context)
-
-        if code == 0x9C:  # ST
-            _change_state(State.ground, context)
-            return
+        if not self._text_runs:
+            for c in text:
+                emit = _advance(ord(c), context)
 
-    @staticmethod
-    def sos_pm_apc_string(code: int, context: _Context):
-        if 0x00 <= code <= 0x7F:  # NULL to '~'
-            # these should be caught by _ANYWHERE and never reach here
-            assert code != 0x18  # CAN
-            assert code != 0x1A  # SUB
-            assert code != 0x1B  # ESC
+                if emit is not None:
+                    events.append(emit)
 
-            return Action.ignore(code, context)
+            return events
 
-        if code == 0x9C:  # ST
-            _change_state(State.ground, context)
-            return
+        i = 0
 
+        while i < len(text):
+            if context.state == State.GROUND and not context.single_shift:
+                m = _TEXT_RUN.match(text, i)
 
-_ANYWHERE: dict[int, tuple[callable, callable]] = {}
-_ANYWHERE.update(
-    {
-        k: (Action.execute, State.ground)
-        for k in itertools.chain(
-            [0x18, 0x1A],  # CAN, SUB
-            [
-                c for c in range(0x80, 0x9B) if c not in [0x90, 0x98]
-            ],  # C1 control chars except DCS, SOS
-        )
-    }
-)
-_ANYWHERE[0x9C] = (Action.ignore, State.ground)  # ST
-_ANYWHERE[0x1B] = (Action.ignore, State.escape)  # ESC
-_ANYWHERE[0x9B] = (Action.ignore, State.csi_entry)  # CSI
-_ANYWHERE[0x90] = (Action.ignore, State.dcs_entry)  # DCS
-_ANYWHERE[0x9D] = (Action.ignore, State.osc_string)  # OSC
-_ANYWHERE.update(
-    {
-        k: (Action.ignore, State.sos_pm_apc_string) for k in [0x98, 0x9E, 0x9F]
-    }  # SOS, PM, APC
-)
+                if m:
+                    events.append(m.group())
+                    i = m.end()
+                    continue
 
+            emit = _advance(ord(text[i]), context)
 
-@dataclasses.dataclass
-class _Context:
-    state: callable[[int, typing.Self], str | None] = dataclasses.field(
-        default=State.ground
-    )
-    private_markers: list[int] = dataclasses.field(default_factory=list)
-    intermediate_chars: list[int] = dataclasses.field(default_factory=list)
-    final_char: int | None = dataclasses.field(default=None)
-    params: list[int] = dataclasses.field(default_factory=list)
-    single_shift: int = dataclasses.field(default=0)
+            if emit is not None:
+                events.append(emit)
 
+            i += 1
 
-def _change_state(new_state, context: _Context):
-    old_state = context.state
+        return events
 
-    on_exit = getattr(old_state, _EXIT_ATTR, None)
+    def flush(self) -> list[typing.Any]:
+        """
+        Resolves a pending lone escape character.
 
-    if on_exit:
-        on_exit(context)
+        This should be called when no more input arrived within a timeout
+        after the last call to :meth:`feed` or when the input has ended.
 
-    on_enter = getattr(new_state, _ENTRY_ATTR, None)
+        Returns:
+            ``["\\x1b"]`` if :attr:`pending_escape` was ``True``, otherwise
+            an empty list.
+        """
+        if self._context.state != State.ESCAPE:
+            return []
 
-    if on_enter:
-        on_enter(context)
+        self._context.state = State.GROUND
+        return ["\x1b"]
 
-    context.state = new_state
 
+async def parse_batches(
+    stream: typing.AsyncIterator[str],
+    escape_timeout: float = 0.05,
+    text_runs: bool = False,
+) -> typing.AsyncGenerator[list[typing.Any], typing.Any]:
+    """
+    Same as :func:`parse` except that all events parsed from each item of
+    *stream* are returned together as a list.
 
-async def parse(
-    stream: typing.AsyncIterator[str], escape_timeout: float = 1
-) -> typing.AsyncGenerator[str, typing.Any]:
-    context = _Context()
+    This allows consumers to handle a batch of events (e.g. update the state
+    for several key presses) before doing something expensive once (e.g.
+    rendering). Empty lists are never returned.
+    """
+    parser = Parser(text_runs)
     i = aiter(stream)
 
     while True:
-        try:
-            # special case for escape key
-            if context.state == State.escape:
-                try:
-                    # If escape char is not followed by another char
-                    # before timeout.
-                    task = asyncio.create_task(anext(i))
-                    c = await asyncio.wait_for(asyncio.shield(task), escape_timeout)
-                except asyncio.CancelledError:
-                    # since the task was shielded from the timeout, only
-                    # the timeout was canceled and we need to cancel the
-                    # inner task as well if this coro was canceled
-                    task.cancel()
-                    raise
-                except StopAsyncIteration:
-                    # escape was the last item in the iter so need to
-                    # be emitted before stopping the parser generator
-                    yield "\x1b"
-                    raise
-                except asyncio.TimeoutError:
-                    # waiting for another item after escape timed out
-                    # reset to ground state and emit the char then keep
-                    # waiting for the next char
-                    _change_state(State.ground, context)
-                    yield "\x1b"
-                    c = await task
-            else:
+        if parser.pending_escape:
+            # Special case for escape key. This only happens when the escape
+            # char was the last char of an item from the stream, otherwise
+            # the following char was already fed to the parser. So there is
+            # only a timeout when actually waiting for more input.
+            task = asyncio.ensure_future(anext(i))
+
+            try:
+                done, _ = await asyncio.wait((task,), timeout=escape_timeout)
+
+                if not done:
+                    # escape char was not followed by another char before
+                    # the timeout, so emit it then keep waiting
+                    yield parser.flush()
+
+                c = await task
+            except StopAsyncIteration:
+                # escape was the last item in the iter so need to
+                # be emitted before stopping the parser generator
+                yield parser.flush()
+                return
+            finally:
+                # in case this generator was canceled or closed
+                task.cancel()
+        else:
+            try:
                 c = await anext(i)
-        except StopAsyncIteration:
-            return
+            except StopAsyncIteration:
+                return
 
-        code = ord(c)
+        batch = parser.feed(c)
 
-        try:
-            action, state = _ANYWHERE[code]
-        except KeyError:
-            emit = context.state(code, context)
-        else:
-            emit = action(code, context)
-            _change_state(state, context)
+        if batch:
+            yield batch
 
-        if emit is not None:
-            yield emit
+
+async def parse(
+    stream: typing.AsyncIterator[str],
+    escape_timeout: float = 0.05,
+    text_runs: bool = False,
+) -> typing.AsyncGenerator[str, typing.Any]:
+    """
+    Parses terminal input into characters and control sequences.
+
+    An escape character followed by a printable character, e.g. from a key
+    pressed with Alt, is returned as :class:`aioterminal.codes.ESC`.
+
+    Args:
+        stream: Text from the terminal, e.g. from
+            :func:`aioterminal.read_chunks`.
+        escape_timeout: Seconds to wait for more input when a read ended with
+            an escape character before returning it as the escape key.
+            Terminals send a whole sequence at once, so when a read ends with
+            an escape character, nothing else was pending and it is most
+            likely the escape key. A short timeout avoids a noticeable delay
+            for the escape key. The trade-off is that a sequence split by a
+            slow connection is returned as the escape key followed by
+            characters; increase the timeout if that happens.
+        text_runs: If ``True``, consecutive printable characters are returned
+            as a single string.
+    """
+    async with contextlib.aclosing(
+        parse_batches(stream, escape_timeout, text_runs)
+    ) as batches:
+        async for batch in batches:
+            for emit in batch:
+                yield emit
@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import array
+
+from . import cursor
+from .codes import CSI, SequenceBuffer
+from .style import Pen
+
+_MAX_STYLES = 1 << 16
+"""
+Number of style ids that fit in the ``"H"`` cell arrays.
+"""
+
+
+class Screen:
+    """
+    Model of the terminal screen that renders only what changed.
+
+    Text is drawn on the screen with :meth:`put` and then :meth:`render`
+    emits the control sequences and text needed to update the terminal from
+    the previous frame to the current frame.
+
+    The terminal is assumed to be blank when the screen is created. If it
+    isn't, call :meth:`invalidate` before the first :meth:`render`. When the
+    terminal is resized, call :meth:`resize`. Each
+    character is assumed to be one column wide.
+
+    When rows have moved up or down since the previous frame, e.g. when a line
+    is added to a log, the terminal is scrolled instead of printing the moved
+    rows again.
+
+    Args:
+        rows: The height of the terminal.
+        columns: The width of the terminal.
+
+    Example::
+
+        screen = Screen(*reversed(os.get_terminal_size()))
+        screen.put(0, 0, "hello", (1,))
+        buf = SequenceBuffer()
+        screen.render(buf)
+        os.write(fd, buf.getbuffer())
+    """
+
+    def __init__(self, rows: int, columns: int) -> None:
+        self.rows = rows
+        self.columns = columns
+
+        # style 0 is always the default style
+        self._styles: list[tuple[int, ...]] = [()]
+        self._style_ids: dict[tuple[int, ...], int] = {(): 0}
+
+        # the frame being drawn
+        self._chars = [[" "] * columns for _ in range(rows)]
+        self._attrs = [array.array("H", bytes(2 * columns)) for _ in range(rows)]
+        self._dirty: set[int] = set()
+
+        # what is currently on the terminal
+        self._front_chars = [[" "] * columns for _ in range(rows)]
+        self._front_attrs = [array.array("H", bytes(2 * columns)) for _ in range(rows)]
+        self._front_hashes: list[int | None] = [None] * rows
+
+        # terminal state - None means unknown
+        self._cursor: tuple[int, int] | None = None
+        self._pen = Pen()
+        self._pen_style: int | None = None
+
+    def put(
+        self, row: int, column: int, text: str, style: tuple[int, ...] = ()
+    ) -> None:
+        """
+        Draws *text* starting at *row* and *column*.
+
+        Text that doesn't fit on the row is clipped.
+
+        Args:
+            row: The 0-based row.
+            column: The 0-based column.
+            text: The text. Must not contain control characters.
+            style: :meth:`CSI.SGR` parameters for the text or empty for the
+                default style.
+
+        Raises:
+            ValueError: if 65,536 different styles are already on the screen
+                and the terminal, so *style* can't be added
+        """
+        if not 0 <= row < self.rows or column >= self.columns:
+            return
+
+        if column < 0:
+            text = text[-column:]
+            column = 0
+
+        text = text[: self.columns - column]
+        end = column + len(text)
+
+        try:
+            style_id = self._style_ids[style]
+        except KeyError:
+            if len(self._styles) == _MAX_STYLES:
+                self._compact_styles()
+
+            style_id = self._style_ids[style] = len(self._styles)
+            self._styles.append(style)
+
+        self._chars[row][column:end] = text
+        self._attrs[row][column:end] = array.array("H", [style_id]) * len(text)
+        self._dirty.add(row)
+
+    def clear(self) -> None:
+        """
+        Clears the whole screen to spaces with the default style.
+        """
+        for row in range(self.rows):
+            self.put(row, 0, " " * self.columns)
+
+    def invalidate(self) -> None:
+        """
+        Forgets what is on the terminal, so that the next :meth:`render` draws
+        everything. Use this if something else changed the terminal. For a
+        resize, use :meth:`resize` instead.
+        """
+        for row in range(self.rows):
+            self._front_chars[row][:] = [""] * self.columns
+            self._front_hashes[row] = None
+
+        self._dirty.update(range(self.rows))
+        self._cursor = None
+        self._pen.reset()
+        self._pen_style = None
+
+    def resize(self, rows: int, columns: int) -> None:
+        """
+        Changes the size of the screen, e.g. after the terminal was resized.
+
+        The frame being drawn is clipped or extended with spaces. Since the
+        terminal may have rearranged its contents, the next :meth:`render`
+        draws everything like after :meth:`invalidate`.
+
+        Args:
+            rows: The new height of the terminal.
+            columns: The new width of the terminal.
+        """
+        chars = [[" "] * columns for _ in range(rows)]
+        attrs = [array.array("H", bytes(2 * columns)) for _ in range(rows)]
+
+        for row in range(min(rows, self.rows)):
+            n = min(columns, self.columns)
+            chars[row][:n] = self._chars[row][:n]
+            attrs[row][:n] = self._attrs[row][:n]
+
+        self.rows = rows
+        self.columns = columns
+        self._chars = chars
+        self._attrs = attrs
+        self._front_chars = [[" "] * columns for _ in range(rows)]
+        self._front_attrs = [array.array("H", bytes(2 * columns)) for _ in range(rows)]
+        self._front_hashes = [None] * rows
+        self._dirty = set()
+        self.invalidate()
+
+    def _compact_styles(self) -> None:
+        """
+        Drops styles that are no longer used by any cell and renumbers the
+        rest, so that style ids don't run out when styles keep changing, e.g.
+        for animated color gradients.
+        """
+        used = {0}
+
+        for attrs in (*self._attrs, *self._front_attrs):
+            used.update(attrs)
+
+        if len(used) == _MAX_STYLES:
+            raise ValueError("too many styles on the screen")
+
+        remap = {old: new for new, old in enumerate(sorted(used))}
+        self._styles = [self._styles[old] for old in sorted(used)]
+        self._style_ids = {style: i for i, style in enumerate(self._styles)}
+
+        for attrs in (*self._attrs, *self._front_attrs):
+            attrs[:] = array.array("H", [remap[i] for i in attrs])
+
+        # the row hashes include the style ids
+        for row, front_hash in enumerate(self._front_hashes):
+            if front_hash is not None:
+                self._front_hashes[row] = hash(
+                    (tuple(self._front_chars[row]), self._front_attrs[row].tobytes())
+                )
+
+        self._pen_style = remap.get(self._pen_style)
+
+    def render(self, buf: SequenceBuffer) -> None:
+        """
+        Appends everything needed to update the terminal to *buf*.
+
+        It is assumed that everything in *buf* is written to the terminal.
+        """
+        # rows that aren't dirty are the same as on the terminal
+        hashes = self._front_hashes.copy()
+
+        for row in self._dirty:
+            hashes[row] = hash((tuple(self._chars[row]), self._attrs[row].tobytes()))
+
+        self._scroll(buf, hashes)
+
+        for row in sorted(self._dirty):
+            if hashes[row] == self._front_hashes[row]:
+                continue
+
+            self._render_row(buf, row)
+
+            self._front_chars[row][:] = self._chars[row]
+            self._front_attrs[row][:] = self._attrs[row]
+            self._front_hashes[row] = hashes[row]
+
+        self._dirty.clear()
+
+    def _scroll(self, buf: SequenceBuffer, hashes: list[int | None]) -> None:
+        """
+        Scrolls part of the terminal if that means fewer rows have to be
+        printed again.
+        """
+        front = self._front_hashes
+        changed = [new is None or new != old for new, old in zip(hashes, front)]
+
+        # scrolling costs about as much as printing one row and exposes at
+        # least one row that has to be printed
+        if sum(changed) < 3:
+            return
+
+        best_gain = 0
+        best = None
+
+        for shift in range(1 - self.rows, self.rows):
+            if shift == 0:
+                continue
+
+            # find runs of rows where row + shift on the terminal is the
+            # same as row in the new frame
+            row = max(0, -shift)
+            end = min(self.rows, self.rows - shift)
+
+            while row < end:
+                if hashes[row] is None or hashes[row] != front[row + shift]:
+                    row += 1
+                    continue
+
+                start = row
+
+                while row < end and hashes[row] == front[row + shift]:
+                    row += 1
+
+                # the scrolled region includes the rows moved out of it
+                top = min(start, start + shift)
+                bottom = max(row, row + shift)
+                gain = sum(changed[top:bottom]) - abs(shift) - 1
+
+                if gain > best_gain:
+                    best_gain = gain
+                    best = (top, bottom, shift)
+
+        if best is None:
+            return
+
+        top, bottom, shift = best
+
+        # new lines are filled with the current background color
+        if self._pen_style != 0:
+            sgr = self._pen.update(())
+
+            if sgr:
+                buf.append(sgr)
+
+            self._pen_style = 0
+
+        full = top == 0 and bottom == self.rows
+
+        if not full:
+            buf.append(CSI.DECSTBM(top + 1, bottom))
+
+        # the parameter can be omitted when it is the default value of 1
+        n = None if abs(shift) == 1 else abs(shift)
+        buf.append(CSI.SU(n) if shift > 0 else CSI.SD(n))
+
+        if not full:
+            # this also moves the cursor to the top left
+            buf.append(CSI.DECSTBM())
+            self._cursor = (0, 0)
+
+        # update the model of the terminal the same way
+        rows = range(top, bottom) if shift > 0 else range(bottom - 1, top - 1, -1)
+
+        for row in rows:
+            if top <= row + shift < bottom:
+                self._front_chars[row][:] = self._front_chars[row + shift]
+                self._front_attrs[row][:] = self._front_attrs[row + shift]
+                self._front_hashes[row] = front[row + shift]
+            else:
+                self._front_chars[row][:] = [" "] * self.columns
+                self._front_attrs[row][:] = array.array("H", bytes(2 * self.columns))
+                self._front_hashes[row] = None
+
+        self._dirty.update(range(top, bottom))
+
+    def _render_row(self, buf: SequenceBuffer, row: int) -> None:
+        chars = self._chars[row]
+        attrs = self._attrs[row]
+        front_chars = self._front_chars[row]
+        front_attrs = self._front_attrs[row]
+        column = 0
+
+        while column < self.columns:
+            if chars[column] == front_chars[column] and (
+                attrs[column] == front_attrs[column]
+            ):
+                column += 1
+                continue
+
+            end = column + 1
+
+            while end < self.columns and (
+                chars[end] != front_chars[end] or attrs[end] != front_attrs[end]
+            ):
+                end += 1
+
+            self._move_to(buf, row, column)
+            self._print(buf, row, column, end)
+            column = end
+
+    def _move_to(self, buf: SequenceBuffer, row: int, column: int) -> None:
+        reprint = None
+
+        if self._cursor is not None:
+            cursor_row, cursor_column = self._cursor
+
+            # if the cells in between have the current style, printing them
+            # again may be shorter than moving the cursor
+            if cursor_row == row and 0 < column - cursor_column <= 8:
+                attrs = self._attrs[row]
+
+                if all(
+                    attrs[c] == self._pen_style for c in range(cursor_column, column)
+                ):
+                    reprint = "".join(self._chars[row][cursor_column:column])
+
+        buf.append(cursor.move(self._cursor, (row, column), reprint))
+
+    def _print(self, buf: SequenceBuffer, row: int, start: int, end: int) -> None:
+        """
+        Prints the cells from *start* to *end* of *row* at the cursor.
+        """
+        chars = self._chars[row]
+        attrs = self._attrs[row]
+
+        while start < end:
+            style_id = attrs[start]
+            run_end = start + 1
+
+            while run_end < end and attrs[run_end] == style_id:
+                run_end += 1
+
+            if style_id != self._pen_style:
+                sgr = self._pen.update(self._styles[style_id])
+
+                if sgr:
+                    buf.append(sgr)
+
+                self._pen_style = style_id
+
+            buf.append("".join(chars[start:run_end]))
+            start = run_end
+
+        # at the last column, the cursor stays put with a pending wrap
+        self._cursor = (row, end) if end < self.columns else None
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import functools
+
+from .codes import CSI
+
+# Character attributes are tracked in slots that can be changed independently
+# of each other. The value of each slot is the tuple of SGR parameters that
+# sets it or an empty tuple for the default.
+
+_INTENSITY = 0
+_ITALIC = 1
+_UNDERLINE = 2
+_BLINK = 3
+_INVERSE = 4
+_HIDDEN = 5
+_CROSSED_OUT = 6
+_FOREGROUND = 7
+_BACKGROUND = 8
+_OVERLINE = 9
+_UNDERLINE_COLOR = 10
+
+_SLOT_RESET = (22, 23, 24, 25, 27, 28, 29, 39, 49, 55, 59)
+"""
+SGR parameter that resets each slot to the default.
+"""
+
+_OTHER = len(_SLOT_RESET)
+"""
+Slot for parameters that aren't known. These can't be reset individually.
+"""
+
+_EXTENDED_COLOR = {38: _FOREGROUND, 48: _BACKGROUND, 58: _UNDERLINE_COLOR}
+
+_SLOT_FOR_PARAM = {
+    1: _INTENSITY,
+    2: _INTENSITY,
+    3: _ITALIC,
+    4: _UNDERLINE,
+    21: _UNDERLINE,
+    5: _BLINK,
+    7: _INVERSE,
+    8: _HIDDEN,
+    9: _CROSSED_OUT,
+    53: _OVERLINE,
+    **{p: _FOREGROUND for p in [*range(30, 38), *range(90, 98)]},
+    **{p: _BACKGROUND for p in [*range(40, 48), *range(100, 108)]},
+}
+
+_DEFAULT: tuple[tuple[int, ...], ...] = ((),) * (len(_SLOT_RESET) + 1)
+
+_State = tuple[tuple[int, ...], ...]
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse(params: tuple[int, ...]) -> _State:
+    """
+    Gets the state after applying SGR *params* to the default state.
+    """
+    slots = list(_DEFAULT)
+    i = 0
+
+    while i < len(params):
+        p = params[i]
+        i += 1
+
+        if p == 0:
+            slots = list(_DEFAULT)
+        elif p in _EXTENDED_COLOR:
+            # extended color: 38;5;n or 38;2;r;g;b
+            n = 2 if i < len(params) and params[i] == 5 else 4
+            slots[_EXTENDED_COLOR[p]] = params[i - 1 : i + n]
+            i += n
+        elif p in _SLOT_RESET:
+            slots[_SLOT_RESET.index(p)] = ()
+        elif p in (1, 2):
+            # bold and faint can both be set
+            slots[_INTENSITY] = tuple(sorted({*slots[_INTENSITY], p}))
+        elif p in _SLOT_FOR_PARAM:
+            slots[_SLOT_FOR_PARAM[p]] = (p,)
+        else:
+            # keep it so that it is sent to the terminal as is
+            slots[_OTHER] += (p,)
+
+    return tuple(slots)
+
+
+@functools.lru_cache(maxsize=1024)
+def _transition(current: _State | None, target: _State) -> tuple[int, ...] | None:
+    """
+    Gets the shortest SGR parameters to change from *current* to *target*.
+    """
+    if current == target:
+        return None
+
+    # option 1: reset everything then set what is needed
+    full = (0,) + tuple(p for slot in target for p in slot)
+
+    if current is None or current[_OTHER] != target[_OTHER]:
+        # unknown parameters can only be undone by a full reset
+        return full
+
+    # option 2: only change what is different
+    delta = []
+
+    for i, (old, new) in enumerate(zip(current[:_OTHER], target[:_OTHER])):
+        if old == new:
+            continue
+
+        if not new:
+            delta.append(_SLOT_RESET[i])
+        elif i == _INTENSITY and not set(old) <= set(new):
+            # e.g. bold -> faint needs to turn off bold first
+            delta.append(_SLOT_RESET[i])
+            delta.extend(new)
+        elif i == _INTENSITY:
+            delta.extend(p for p in new if p not in old)
+        else:
+            # colors, etc. replace the old value
+            delta.extend(new)
+
+    delta = tuple(delta)
+
+    if len(CSI.SGR(*delta).params) <= len(CSI.SGR(*full).params):
+        return delta
+
+    return full
+
+
+class Pen:
+    """
+    Tracks the current character attributes of a terminal.
+
+    This is used to only send the SGR parameters that actually change the
+    attributes when switching between styles.
+
+    Example::
+
+        pen = Pen()
+
+        for text, style in spans:
+            sgr = pen.update(style)
+
+            if sgr:
+                buf.append(sgr)
+
+            buf.append(text)
+    """
+
+    def __init__(self) -> None:
+        self._state: _State | None = None
+
+    def reset(self) -> None:
+        """
+        Forgets the current attributes, e.g. because something else may have
+        changed them. The next :meth:`update` will do a full reset.
+        """
+        self._state = None
+
+    def update(self, style: tuple[int, ...]) -> CSI | None:
+        """
+        Changes the attributes to *style*.
+
+        Args:
+            style: :meth:`CSI.SGR` parameters starting from the default
+                attributes, e.g. ``(1, 31)`` for bold red text. Empty for the
+                default attributes.
+
+        Returns:
+            A single SGR control sequence or ``None`` if nothing needs to
+            change.
+        """
+        target = _parse(style)
+        params = _transition(self._state, target)
+        self._state = target
+
+        if params is None:
+            return None
+
+        return CSI.SGR(*params)
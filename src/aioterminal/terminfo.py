@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import typing
+
+from .codes import CSI, SS3
+from .keys import Key, KeyEvent, Modifier, _intern
+from .parser import Parser
+
+_MAGIC = 0o432
+_MAGIC_32BIT = 0o1036
+"""
+Magic number of the extended number format with 32-bit numbers.
+"""
+
+# Indexes of string capabilities in the compiled format. These are the same
+# as the order in ncurses Caps file.
+_KEY_CAPABILITIES: dict[int, tuple[Key, Modifier]] = {
+    55: (Key.BACKSPACE, Modifier.NONE),  # kbs
+    59: (Key.DELETE, Modifier.NONE),  # kdch1
+    61: (Key.DOWN_ARROW, Modifier.NONE),  # kcud1
+    66: (Key.F1, Modifier.NONE),  # kf1
+    67: (Key.F10, Modifier.NONE),  # kf10
+    68: (Key.F2, Modifier.NONE),  # kf2
+    69: (Key.F3, Modifier.NONE),  # kf3
+    70: (Key.F4, Modifier.NONE),  # kf4
+    71: (Key.F5, Modifier.NONE),  # kf5
+    72: (Key.F6, Modifier.NONE),  # kf6
+    73: (Key.F7, Modifier.NONE),  # kf7
+    74: (Key.F8, Modifier.NONE),  # kf8
+    75: (Key.F9, Modifier.NONE),  # kf9
+    76: (Key.HOME, Modifier.NONE),  # khome
+    77: (Key.INSERT, Modifier.NONE),  # kich1
+    79: (Key.LEFT_ARROW, Modifier.NONE),  # kcub1
+    81: (Key.PAGE_DOWN, Modifier.NONE),  # knp
+    82: (Key.PAGE_UP, Modifier.NONE),  # kpp
+    83: (Key.RIGHT_ARROW, Modifier.NONE),  # kcuf1
+    87: (Key.UP_ARROW, Modifier.NONE),  # kcuu1
+    148: (Key.TAB, Modifier.SHIFT),  # kcbt
+    158: (Key.BEGIN, Modifier.NONE),  # kbeg
+    164: (Key.END, Modifier.NONE),  # kend
+    165: (Key.ENTER, Modifier.NONE),  # kent
+    191: (Key.DELETE, Modifier.SHIFT),  # kDC
+    194: (Key.END, Modifier.SHIFT),  # kEND
+    199: (Key.HOME, Modifier.SHIFT),  # kHOM
+    200: (Key.INSERT, Modifier.SHIFT),  # kIC
+    201: (Key.LEFT_ARROW, Modifier.SHIFT),  # kLFT
+    204: (Key.PAGE_DOWN, Modifier.SHIFT),  # kNXT
+    206: (Key.PAGE_UP, Modifier.SHIFT),  # kPRV
+    210: (Key.RIGHT_ARROW, Modifier.SHIFT),  # kRIT
+    # kf11 to kf20
+    **{216 + i: (Key[f"F{11 + i}"], Modifier.NONE) for i in range(10)},
+}
+
+_DIRS = ["/etc/terminfo", "/lib/terminfo", "/usr/share/terminfo"]
+"""
+Default locations of the terminfo database.
+"""
+
+
+def _search_dirs() -> list[str]:
+    dirs = []
+
+    if "TERMINFO" in os.environ:
+        dirs.append(os.environ["TERMINFO"])
+
+    dirs.append(os.path.expanduser("~/.terminfo"))
+
+    for d in os.environ.get("TERMINFO_DIRS", "").split(os.pathsep):
+        # an empty entry means the default locations
+        dirs.extend([d] if d else _DIRS)
+
+    dirs.extend(_DIRS)
+
+    return dirs
+
+
+def find(term: str) -> str | None:
+    """
+    Finds the compiled terminfo file for *term*.
+
+    Args:
+        term: The terminal name, e.g. ``"xterm-256color"``.
+
+    Returns:
+        The path or ``None`` if not found.
+    """
+    if not term or "/" in term:
+        return None
+
+    for d in _search_dirs():
+        # macOS uses the hex code of the first letter instead of the letter
+        for subdir in (term[0], f"{ord(term[0]):x}"):
+            path = os.path.join(d, subdir, term)
+
+            if os.path.isfile(path):
+                return path
+
+    return None
+
+
+def read_strings(data: bytes) -> list[bytes | None]:
+    """
+    Reads the string capabilities from a compiled terminfo file.
+
+    Extended (user-defined) capabilities are not read.
+
+    Args:
+        data: The contents of the file.
+
+    Returns:
+        The value of each capability by index or ``None`` if the capability is
+        absent or cancelled.
+
+    Raises:
+        ValueError: if *data* is not a compiled terminfo file
+    """
+    try:
+        magic, names_size, bools, numbers, strings, table_size = struct.unpack_from(
+            "<6h", data
+        )
+    except struct.error:
+        raise ValueError("not a terminfo file")
+
+    if magic not in (_MAGIC, _MAGIC_32BIT):
+        raise ValueError("not a terminfo file")
+
+    pos = 12 + names_size + bools
+    # numbers are aligned to an even byte
+    pos += pos % 2
+    pos += numbers * (4 if magic == _MAGIC_32BIT else 2)
+
+    offsets = struct.unpack_from(f"<{strings}h", data, pos)
+    table = data[pos + 2 * strings : pos + 2 * strings + table_size]
+    values: list[bytes | None] = []
+
+    for offset in offsets:
+        # -1 is absent and -2 is cancelled
+        if offset < 0 or offset >= len(table):
+            values.append(None)
+            continue
+
+        end = table.find(b"\0", offset)
+        values.append(table[offset : end if end >= 0 else len(table)])
+
+    return values
+
+
+def _key_sequences(path: str) -> dict[str, tuple[str, int]]:
+    with open(path, "rb") as f:
+        strings = read_strings(f.read())
+
+    sequences = {}
+
+    for index, (key, modifiers) in _KEY_CAPABILITIES.items():
+        if index < len(strings) and strings[index]:
+            sequences[strings[index].decode("latin-1")] = (key.name, int(modifiers))
+
+    return sequences
+
+
+def _cache_path(term: str) -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "aioterminal", f"terminfo-{term}.json")
+
+
+def _load_cached(term: str, path: str) -> dict[str, tuple[str, int]]:
+    """
+    Gets the key sequences from the cache or the terminfo file if the cache
+    is missing or out of date.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cache_path = _cache_path(term)
+
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+
+        if cached["path"] == path and cached["mtime"] == mtime:
+            sequences = {
+                seq: (name, mods) for seq, (name, mods) in cached["keys"].items()
+            }
+
+            # the cache could have been written by another version
+            if all(
+                isinstance(seq, str)
+                and name in Key.__members__
+                and isinstance(mods, int)
+                and 0 <= mods <= 0xF
+                for seq, (name, mods) in sequences.items()
+            ):
+                return sequences
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    sequences = _key_sequences(path)
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}"
+
+        with open(tmp, "w") as f:
+            json.dump({"path": path, "mtime": mtime, "keys": sequences}, f)
+
+        os.replace(tmp, cache_path)
+    except OSError:
+        # caching is optional
+        pass
+
+    return sequences
+
+
+def load_keys(term: str | None = None) -> dict[str | SS3 | CSI, KeyEvent]:
+    """
+    Gets the key sequences from the terminfo database.
+
+    The sequences are parsed the same way as :func:`aioterminal.parser.parse`,
+    so the result can be used to look up the codes it yields, e.g. as the
+    *fallback* for :func:`aioterminal.keys.key_event`.
+
+    The sequences read from the terminfo file are cached in
+    ``$XDG_CACHE_HOME/aioterminal`` until the file changes.
+
+    Args:
+        term: The terminal name. Default uses ``$TERM``.
+
+    Returns:
+        A lookup of parsed codes to key events. Empty if there is no terminfo
+        file for *term*.
+    """
+    if term is None:
+        term = os.environ.get("TERM", "")
+
+    path = find(term)
+
+    if path is None:
+        return {}
+
+    try:
+        sequences = _load_cached(term, path)
+    except (OSError, ValueError):
+        return {}
+
+    lookup: dict[typing.Any, KeyEvent] = {}
+
+    for seq, (name, modifiers) in sequences.items():
+        parser = Parser()
+        codes = parser.feed(seq) + parser.flush()
+
+        # sequences that aren't a single code can't be looked up
+        if len(codes) == 1:
+            code = codes[0]
+            text = code if isinstance(code, str) else ""
+            lookup.setdefault(code, _intern(Key[name], modifiers, text))
+
+    return lookup
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import sys
+import typing
+
+from . import _assert_is_a_tty
+from .codes import CSI, SequenceBuffer
+
+_ON_POSIX = "posix" in sys.builtin_module_names
+
+_SYNCHRONIZED_OUTPUT = 2026
+"""
+DEC private mode for synchronized output.
+
+https://gist.github.com/christianparpart/d8a62cc1ab659194337d73e399004036
+"""
+
+_synchronized_output_cache: dict[str | None, bool] = {}
+"""
+Results of :meth:`Writer.probe_synchronized_output` by ``$TERM``.
+"""
+
+
+class Writer:
+    """
+    Non-blocking writer for a terminal.
+
+    Data is written as soon as the terminal can accept it without blocking the
+    event loop. Anything that can't be written right away is buffered and
+    written when the terminal becomes writable again. Use :meth:`drain` to
+    wait for the buffer to empty out when writing a lot of data.
+
+    For full-screen updates, :meth:`write_frame` can be used instead of
+    :meth:`write` so that frames that can't be sent before the next frame
+    is ready are skipped instead of piling up. :meth:`frame` also uses
+    synchronized output to keep the terminal from drawing partial frames.
+
+    On Windows, writes are done synchronously.
+
+    Args:
+        fd: The file descriptor of a terminal. Default uses stdout.
+        high_water: Number of buffered bytes at which :meth:`drain` starts
+            waiting. Default is 64 KiB.
+        low_water: Number of buffered bytes at which :meth:`drain` stops
+            waiting. Default is a quarter of *high_water*.
+
+    Raises:
+        OSError: with ``errno.ENOTTY`` if *fd* is not a terminal
+
+    Example::
+
+        async with Writer() as writer:
+            writer.write(b"hello")
+            await writer.drain()
+    """
+
+    def __init__(
+        self, fd: int = None, high_water: int = 64 * 1024, low_water: int = None
+    ) -> None:
+        if fd is None:
+            fd = sys.stdout.fileno()
+
+        fd = _assert_is_a_tty(fd)
+
+        if low_water is None:
+            low_water = high_water // 4
+
+        if not 0 <= low_water <= high_water:
+            raise ValueError("must have 0 <= low_water <= high_water")
+
+        self._loop = asyncio.get_running_loop()
+        self._high_water = high_water
+        self._low_water = low_water
+        self._buf = bytearray()
+        self._writing = False
+        self._error: OSError | None = None
+        self._waiters: list[tuple[int, asyncio.Future[None]]] = []
+        self._pending_frame: bytes | None = None
+        self.frames_written = 0
+        """
+        The number of frames passed to :meth:`write_frame` that were written.
+        """
+        self.frames_dropped = 0
+        """
+        The number of frames passed to :meth:`write_frame` that were replaced
+        by a newer frame before they could be written.
+        """
+        self.synchronized_output: bool | None = _synchronized_output_cache.get(
+            os.environ.get("TERM")
+        )
+        """
+        Whether the terminal supports synchronized output or ``None`` if
+        unknown. See :meth:`probe_synchronized_output`.
+        """
+        self._probe_result: bool | None = None
+
+        if _ON_POSIX:
+            # NB: setting O_NONBLOCK on a dup() of fd would also affect the
+            # original fd (e.g. print() to stdout), so the terminal is opened
+            # again to get an independent file description.
+            self._fd = os.open(
+                os.ttyname(fd), os.O_WRONLY | os.O_NOCTTY | os.O_NONBLOCK
+            )
+        else:
+            self._fd = os.dup(fd)
+
+    async def __aenter__(self) -> Writer:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            if exc_info[0] is None:
+                await self.flush()
+        finally:
+            self.close()
+
+    @property
+    def buffered(self) -> int:
+        """
+        The number of bytes waiting to be written.
+        """
+        return len(self._buf) + len(self._pending_frame or b"")
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Writes *data* to the terminal without blocking.
+
+        Raises:
+            OSError: if a previous write failed
+        """
+        if self._error:
+            raise self._error
+
+        if self._fd < 0:
+            raise ValueError("writer is closed")
+
+        if not data:
+            return
+
+        if self._buf:
+            # have to wait for previous data to be written first
+            self._commit_frame()
+            self._buf += data
+            return
+
+        self._write(data)
+
+    def write_frame(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Writes a complete frame to the terminal without blocking.
+
+        If previously written data is still waiting to be written, the frame
+        is held back until then. If another frame is written before that
+        happens, it replaces this frame, so only the most recent frame is
+        written once the terminal catches up.
+
+        Raises:
+            OSError: if a previous write failed
+        """
+        if self._error:
+            raise self._error
+
+        if self._fd < 0:
+            raise ValueError("writer is closed")
+
+        if self._buf:
+            if self._pending_frame is not None:
+                self.frames_dropped += 1
+
+            # copy since data could be a reused buffer
+            self._pending_frame = bytes(data)
+            return
+
+        self.frames_written += 1
+        self._write(data)
+
+    @contextlib.contextmanager
+    def frame(self) -> typing.Iterator[SequenceBuffer]:
+        """
+        Context manager for building a frame that is written with
+        :meth:`write_frame` when the context exits.
+
+        Unless the terminal is known not to support it, the frame is bracketed
+        with ``CSI ? 2026 h`` and ``CSI ? 2026 l`` so that the terminal updates
+        the screen all at once instead of drawing partial frames. Terminals
+        that don't support this ignore these sequences.
+
+        Example::
+
+            with writer.frame() as buf:
+                buf.append(CSI.CUP(1, 1), "hello")
+        """
+        synchronized = self.synchronized_output is not False
+        buf = SequenceBuffer()
+
+        if synchronized:
+            buf.append(CSI.DECSET(_SYNCHRONIZED_OUTPUT))
+
+        yield buf
+
+        if synchronized:
+            buf.append(CSI.DECRST(_SYNCHRONIZED_OUTPUT))
+
+        self.write_frame(bytes(buf))
+
+    def probe_synchronized_output(self) -> None:
+        """
+        Queries the terminal for synchronized output support.
+
+        This sends a DECRQM request followed by a primary device attributes
+        request (which all terminals reply to). The parsed input from the
+        terminal has to be passed to :meth:`handle_reply` to get the result.
+
+        If the result is already known for ``$TERM``, nothing is sent.
+        """
+        term = os.environ.get("TERM")
+
+        if term in _synchronized_output_cache:
+            self.synchronized_output = _synchronized_output_cache[term]
+            return
+
+        self._probe_result = False
+        self.write(
+            CSI.PRIVATE_DECRQM(_SYNCHRONIZED_OUTPUT).encode()
+            + CSI.PRIMARY_DA().encode()
+        )
+
+    def handle_reply(self, event: typing.Any) -> bool:
+        """
+        Handles replies to :meth:`probe_synchronized_output`.
+
+        Once the replies have been received, the result is stored in
+        :attr:`synchronized_output` and cached for other writers in the same
+        process with the same ``$TERM``.
+
+        Args:
+            event: An event parsed from the terminal input, e.g. from
+                :func:`aioterminal.parser.parse`.
+
+        Returns:
+            ``True`` if *event* was a reply, otherwise ``False`` and the event
+            should be handled as usual.
+        """
+        if self._probe_result is None:
+            return False
+
+        if not isinstance(event, CSI) or event.private != "?":
+            return False
+
+        if event.intermediate == "$" and event.final == "y":
+            # DECRPM - CSI ? Ps ; Pm $ y
+            mode, _, value = event.params.partition(";")
+
+            if mode != str(_SYNCHRONIZED_OUTPUT):
+                return False
+
+            # 0 = not recognized, 4 = permanently reset
+            self._probe_result = value in ("1", "2", "3")
+            return True
+
+        if not event.intermediate and event.final == "c":
+            # primary device attributes reply always comes last
+            _synchronized_output_cache[os.environ.get("TERM")] = self._probe_result
+            self.synchronized_output = self._probe_result
+            self._probe_result = None
+            return True
+
+        return False
+
+    def _write(self, data: bytes | bytearray | memoryview) -> None:
+        try:
+            n = os.write(self._fd, data)
+        except BlockingIOError:
+            n = 0
+
+        if n < len(data):
+            self._buf += memoryview(data)[n:]
+            self._start_writing()
+
+    async def drain(self) -> None:
+        """
+        Waits for the buffer to shrink below the low water mark if it is
+        above the high water mark, otherwise returns immediately.
+
+        Raises:
+            OSError: if writing failed
+        """
+        if self.buffered > self._high_water:
+            await self._wait(self._low_water)
+
+        if self._error:
+            raise self._error
+
+    async def flush(self) -> None:
+        """
+        Waits for all buffered data to be written.
+
+        Raises:
+            OSError: if writing failed
+        """
+        if self.buffered:
+            await self._wait(0)
+
+        if self._error:
+            raise self._error
+
+    def close(self) -> None:
+        """
+        Closes the writer. Data that hasn't been written yet is discarded.
+        """
+        if self._fd < 0:
+            return
+
+        self._stop_writing()
+        os.close(self._fd)
+        self._fd = -1
+        self._buf.clear()
+        self._pending_frame = None
+        self._wake()
+
+    def _commit_frame(self) -> None:
+        if self._pending_frame is not None:
+            self._buf += self._pending_frame
+            self._pending_frame = None
+            self.frames_written += 1
+
+    def _wait(self, limit: int) -> asyncio.Future[None]:
+        waiter = self._loop.create_future()
+        self._waiters.append((limit, waiter))
+        return waiter
+
+    def _wake(self) -> None:
+        waiters = []
+
+        for limit, waiter in self._waiters:
+            if waiter.done():
+                continue
+
+            if self.buffered <= limit:
+                waiter.set_result(None)
+            else:
+                waiters.append((limit, waiter))
+
+        self._waiters = waiters
+
+    def _start_writing(self) -> None:
+        if self._writing:
+            return
+
+        if _ON_POSIX:
+            self._loop.add_writer(self._fd, self._on_writable)
+            self._writing = True
+        else:
+            # no way to wait for a console to be writable
+            while self._buf:
+                self._on_writable()
+
+    def _stop_writing(self) -> None:
+        if self._writing:
+            self._loop.remove_writer(self._fd)
+            self._writing = False
+
+    def _on_writable(self) -> None:
+        try:
+            n = os.write(self._fd, self._buf)
+        except BlockingIOError:
+            return
+        except OSError as ex:
+            self._error = ex
+            self._stop_writing()
+            self._buf.clear()
+            self._pending_frame = None
+            self._wake()
+            return
+
+        del self._buf[:n]
+
+        if not self._buf:
+            self._commit_frame()
+
+        if not self._buf:
+            self._stop_writing()
+
+        self._wake()
@@ -0,0 +1,151 @@
+import asyncio
+import contextlib
+import os
+import sys
+
+import pytest
+
+import aioterminal
+from aioterminal import parser
+from aioterminal.bindings import Bindings, parse_key
+from aioterminal.codes import CSI, ESC, SS3
+from aioterminal.keys import Key, KeyEvent, Modifier, key_event
+
+
+@pytest.mark.parametrize(
+    "spec,event",
+    [
+        ("g", KeyEvent(None, text="g")),
+        ("G", KeyEvent(None, text="G")),
+        ("Ctrl-X", KeyEvent(None, Modifier.CTRL, "x")),
+        ("ctrl-alt-x", KeyEvent(None, Modifier.CTRL | Modifier.ALT, "x")),
+        ("Alt-Up", KeyEvent(Key.UP_ARROW, Modifier.ALT)),
+        ("Shift-Tab", KeyEvent(Key.TAB, Modifier.SHIFT)),
+        ("PageDown", KeyEvent(Key.PAGE_DOWN)),
+        ("F12", KeyEvent(Key.F12)),
+        ("-", KeyEvent(None, text="-")),
+        ("Ctrl--", KeyEvent(None, Modifier.CTRL, "-")),
+    ],
+)
+def test_parse_key(spec, event):
+    assert parse_key(spec) == event
+
+
+@pytest.mark.parametrize("spec", ["Hyper-x", "Foo", "Ctrl-"])
+def test_parse_key_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_key(spec)
+
+
+def feed(bindings, *codes):
+    return [bindings.feed(key_event(code)) for code in codes]
+
+
+@pytest.mark.asyncio
+async def test_dispatch():
+    calls = []
+    bindings = Bindings()
+    bindings.bind("Ctrl-X Ctrl-S", lambda: calls.append("save"))
+    bindings.bind("Ctrl-X Ctrl-C", lambda: calls.append("quit"))
+    bindings.bind("Up", lambda: calls.append("up"))
+
+    assert feed(bindings, "\x18", "\x13") == [True, True]
+    assert calls == ["save"]
+
+    # the same key from different sequences
+    assert feed(bindings, CSI(final="A"), SS3("A")) == [True, True]
+    assert calls == ["save", "up", "up"]
+
+    assert feed(bindings, "a", CSI(params="1;5", final="A")) == [False, False]
+    assert calls == ["save", "up", "up"]
+    assert not bindings.pending
+
+
+@pytest.mark.asyncio
+async def test_broken_sequence():
+    calls = []
+    bindings = Bindings()
+    bindings.bind("g g", lambda: calls.append("gg"))
+    bindings.bind("x", lambda: calls.append("x"))
+
+    # the sequence is abandoned and x is handled on its own
+    assert feed(bindings, "g", "x", "g", "a") == [True, True, True, False]
+    assert calls == ["x"]
+    assert not bindings.pending
+
+
+@pytest.mark.asyncio
+async def test_chord_timeout():
+    calls = []
+    bindings = Bindings(chord_timeout=0.01)
+    bindings.bind("g", lambda: calls.append("g"))
+    bindings.bind("g g", lambda: calls.append("gg"))
+
+    feed(bindings, "g", "g")
+    assert calls == ["gg"]
+
+    feed(bindings, "g")
+    assert bindings.pending
+    assert calls == ["gg"]
+
+    await asyncio.sleep(0.05)
+    assert calls == ["gg", "g"]
+    assert not bindings.pending
+
+    # a different key ends the sequence too
+    feed(bindings, "g", "h")
+    assert calls == ["gg", "g", "g"]
+
+
+@pytest.mark.asyncio
+async def test_reset():
+    calls = []
+    bindings = Bindings(chord_timeout=0.01)
+    bindings.bind("a b", lambda: calls.append("ab"))
+
+    feed(bindings, "a")
+    bindings.reset()
+    feed(bindings, "b")
+    await asyncio.sleep(0.05)
+
+    assert calls == []
+
+
+def test_bind_empty():
+    with pytest.raises(ValueError):
+        Bindings().bind("", lambda: None)
+
+
+@pytest.mark.asyncio
+async def test_alt():
+    calls = []
+    bindings = Bindings()
+    bindings.bind("Alt-x", lambda: calls.append("alt-x"))
+
+    assert feed(bindings, ESC("x"), "x") == [True, False]
+    assert calls == ["alt-x"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires a pseudo-terminal")
+@pytest.mark.asyncio
+async def test_enter_from_terminal():
+    calls = []
+    bindings = Bindings()
+    bindings.bind("Enter", lambda: calls.append("enter"))
+
+    controller, terminal = os.openpty()
+
+    try:
+        # char_mode() leaves CR to NL translation on, so Enter is read as "\n"
+        with aioterminal.char_mode(terminal):
+            os.write(controller, b"\r")
+
+            async with contextlib.aclosing(
+                parser.parse(aioterminal.read_chunks(terminal))
+            ) as codes:
+                assert bindings.feed(key_event(await anext(codes)))
+    finally:
+        os.close(terminal)
+        os.close(controller)
+
+    assert calls == ["enter"]
@@ -1,4 +1,4 @@
-from aioterminal.codes import CSI
+from aioterminal.codes import CSI, ESC, SS2, SS3, SequenceBuffer
 
 
 def test_name():
@@ -14,3 +14,28 @@ def test_repr():
 
     # named instances have special repr
     assert repr(CSI.HPA(1)) == "CSI.HPA('1')"
+
+
+def test_encode():
+    assert CSI.CUP(1, 2).encode() == b"\x1b[1;2H"
+    assert bytes(CSI.DECSET(2026)) == b"\x1b[?2026h"
+    assert CSI.SGR().encode(eight_bit=True) == b"\x9bm"
+    assert bytes(SS2("a")) == b"\x1bNa"
+    assert SS3("P").encode() == b"\x1bOP"
+    assert SS3("P").encode(eight_bit=True) == b"\x8fP"
+    assert ESC("x").encode(eight_bit=True) == b"\x1bx"
+
+
+def test_sequence_buffer():
+    buf = SequenceBuffer()
+    buf.append(CSI.CUP(1, 1), "é", b"\r", SS3("A"))
+    buf.append(CSI.SGR())
+
+    assert len(buf) == 15
+    assert bytes(buf) == b"\x1b[1;1H\xc3\xa9\r\x1bOA\x1b[m"
+
+    with buf.getbuffer() as view:
+        assert view == b"\x1b[1;1H\xc3\xa9\r\x1bOA\x1b[m"
+
+    buf.clear()
+    assert bytes(buf) == b""
@@ -0,0 +1,73 @@
+import pytest
+
+from aioterminal.codes import CSI
+from aioterminal.color import ColorMode, background, foreground, quantize, to_16, to_256
+
+
+@pytest.mark.parametrize(
+    "rgb,expected",
+    [
+        ((0, 0, 0), 16),
+        ((255, 255, 255), 231),
+        ((255, 0, 0), 196),
+        ((0, 255, 0), 46),
+        ((0, 0, 255), 21),
+        ((95, 135, 175), 67),
+        ((118, 118, 118), 243),
+        ((8, 8, 8), 232),
+        ((238, 238, 238), 255),
+    ],
+)
+def test_to_256(rgb, expected):
+    assert to_256(*rgb) == expected
+
+
+@pytest.mark.parametrize(
+    "rgb,expected",
+    [
+        ((0, 0, 0), 0),
+        ((200, 0, 0), 1),
+        ((255, 10, 10), 9),
+        ((120, 120, 120), 8),
+        ((250, 250, 250), 15),
+        ((90, 90, 250), 12),
+    ],
+)
+def test_to_16(rgb, expected):
+    assert to_16(*rgb) == expected
+
+
+@pytest.mark.parametrize(
+    "mode,fg,bg",
+    [
+        (ColorMode.TRUECOLOR, (38, 2, 255, 0, 0), (48, 2, 255, 0, 0)),
+        (ColorMode.XTERM_256, (38, 5, 196), (48, 5, 196)),
+        (ColorMode.XTERM_16, (91,), (101,)),
+    ],
+)
+def test_foreground_background(mode, fg, bg):
+    assert foreground(255, 0, 0, mode) == fg
+    assert background(255, 0, 0, mode) == bg
+
+
+def test_sgr():
+    assert CSI.SGR(*foreground(1, 2, 3)).encode() == b"\x1b[38;2;1;2;3m"
+    assert CSI.SGR(*background(0, 0, 0, ColorMode.XTERM_16)).encode() == b"\x1b[40m"
+
+
+def test_quantize():
+    numpy = pytest.importorskip("numpy")
+
+    rng = numpy.random.default_rng(0)
+    pixels = rng.integers(0, 256, (4, 5, 3), dtype=numpy.uint8)
+
+    for mode, scalar in [(ColorMode.XTERM_256, to_256), (ColorMode.XTERM_16, to_16)]:
+        result = quantize(pixels, mode)
+
+        assert result.shape == (4, 5)
+        assert result.tolist() == [
+            [scalar(*(int(c) for c in pixel)) for pixel in row] for row in pixels
+        ]
+
+    with pytest.raises(ValueError):
+        quantize(pixels, ColorMode.TRUECOLOR)
@@ -0,0 +1,30 @@
+import pytest
+
+from aioterminal.cursor import move
+
+
+@pytest.mark.parametrize(
+    "start,end,expected",
+    [
+        ((0, 0), (0, 0), b""),
+        (None, (0, 0), b"\x1b[H"),
+        (None, (4, 0), b"\x1b[5H"),
+        (None, (4, 9), b"\x1b[5;10H"),
+        ((4, 9), (4, 10), b"\x1b[C"),
+        ((4, 9), (4, 8), b"\b"),
+        ((4, 9), (4, 5), b"\x1b[4D"),
+        ((4, 9), (4, 0), b"\r"),
+        ((4, 9), (3, 9), b"\x1b[A"),
+        ((4, 9), (5, 0), b"\r\n"),
+        ((4, 9), (6, 0), b"\r\n\n"),
+        ((4, 9), (20, 30), b"\x1b[21;31H"),
+        ((40, 9), (2, 9), b"\x1b[3d"),
+    ],
+)
+def test_move(start, end, expected):
+    assert move(start, end) == expected
+
+
+def test_move_reprint():
+    assert move((0, 0), (0, 2), reprint="ab") == b"ab"
+    assert move((0, 0), (0, 5), reprint="abcde") == b"\x1b[5C"
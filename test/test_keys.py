@@ -1,7 +1,9 @@
+import dataclasses
+
 import pytest
 
-from aioterminal.codes import CSI, SS3
-from aioterminal.keys import Key, code_to_key
+from aioterminal.codes import CSI, ESC, SS3
+from aioterminal.keys import Key, KeyEvent, Modifier, code_to_key, key_event
 
 
 @pytest.mark.parametrize(
@@ -54,9 +56,82 @@ from aioterminal.keys import Key, code_to_key
         (SS3("Q"), Key.F2),
         (SS3("R"), Key.F3),
         (SS3("S"), Key.F4),
+        (CSI(params="1;5", final="A"), Key.UP_ARROW),
+        (CSI(params="3;2", final="~"), Key.DELETE),
+        (CSI(final="Z"), Key.TAB),
         # most printable characters don't currently have a key
         ("a", None),
+        (CSI(params="7", final="~"), None),
+        (CSI(private="?", final="A"), None),
     ],
 )
 def test_code_to_key(code, key):
     assert code_to_key(code) == key
+
+
+@pytest.mark.parametrize(
+    "code,event",
+    [
+        (CSI(final="A"), KeyEvent(Key.UP_ARROW)),
+        (CSI(params="1;5", final="A"), KeyEvent(Key.UP_ARROW, Modifier.CTRL)),
+        (CSI(params="1;2", final="P"), KeyEvent(Key.F1, Modifier.SHIFT)),
+        (
+            CSI(params="5;7", final="~"),
+            KeyEvent(Key.PAGE_UP, Modifier.ALT | Modifier.CTRL),
+        ),
+        (
+            CSI(params="15;16", final="~"),
+            KeyEvent(
+                Key.F5, Modifier.SHIFT | Modifier.ALT | Modifier.CTRL | Modifier.META
+            ),
+        ),
+        (CSI(params="1;5:1", final="B"), KeyEvent(Key.DOWN_ARROW, Modifier.CTRL)),
+        (CSI(final="Z"), KeyEvent(Key.TAB, Modifier.SHIFT)),
+        (CSI(params="1;x", final="A"), KeyEvent(Key.UP_ARROW)),
+        (SS3("P"), KeyEvent(Key.F1)),
+        ("\r", KeyEvent(Key.ENTER, text="\r")),
+        ("\n", KeyEvent(Key.ENTER, text="\n")),
+        ("a", KeyEvent(None, text="a")),
+        ("abc", KeyEvent(None, text="abc")),
+        ("\x01", KeyEvent(None, Modifier.CTRL, "a")),
+        ("\x18", KeyEvent(None, Modifier.CTRL, "x")),
+        ("\x1d", KeyEvent(None, Modifier.CTRL, "]")),
+        ("\x00", KeyEvent(Key.SPACE, Modifier.CTRL)),
+        ("a\x01", None),
+        (CSI(final="x"), None),
+        (ESC("x"), KeyEvent(None, Modifier.ALT, "x")),
+        (ESC("X"), KeyEvent(None, Modifier.ALT, "X")),
+        (ESC("é"), KeyEvent(None, Modifier.ALT, "é")),
+        (ESC("\r"), KeyEvent(Key.ENTER, Modifier.ALT, "\r")),
+        (ESC("\x18"), KeyEvent(None, Modifier.ALT | Modifier.CTRL, "x")),
+        (ESC("\x7f"), KeyEvent(Key.BACKSPACE, Modifier.ALT, "\x7f")),
+    ],
+)
+def test_key_event(code, event):
+    assert key_event(code) == event
+
+
+def test_key_event_interned():
+    code = CSI(params="1;3", final="C")
+
+    assert key_event(code) is key_event(CSI(params="1;3", final="C"))
+    assert key_event(CSI(final="C")) is key_event(CSI(params="1", final="C"))
+    assert key_event("x") is key_event("x")
+    assert key_event(ESC("x")) is key_event(ESC("x"))
+
+
+def test_key_event_immutable():
+    event = key_event("x")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        event.text = "y"
+
+    assert not hasattr(event, "__dict__")
+
+
+def test_key_event_match():
+    match key_event(CSI(params="1;5", final="A")):
+        case KeyEvent(Key.UP_ARROW, Modifier.CTRL):
+            pass
+        case _:
+            pytest.fail("no match")
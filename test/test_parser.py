@@ -2,7 +2,7 @@ import asyncio
 import pytest
 
 from aioterminal import parser
-from aioterminal.codes import CSI, SS3
+from aioterminal.codes import CSI, ESC, SS2, SS3
 
 
 async def aiter_str(s: str):
@@ -33,6 +33,18 @@ async def _parse(s: str):
         ("\x1b[?1J", [CSI.DECSED(1)]),
         ("\x1b[1a", [CSI.HPR(1)]),
         ("\x1bOP", [SS3("P")]),
+        ("\xe9", ["\xe9"]),
+        ("\x9b1@", [CSI.ICH(1)]),
+        ("\x1b[1:2Ax", ["x"]),
+        ("\x1b(Bx", ["x"]),
+        ("\x1b(Ox", ["x"]),
+        ("\x1bx", [ESC("x")]),
+        ("\x1b\x7f", [ESC("\x7f")]),
+        ("\x1b1a", [ESC("1"), "a"]),
+        ("\x1béa", [ESC("é"), "a"]),
+        ("\x1b\ra", [ESC("\r"), "a"]),
+        ("\x1b#Nab", ["a", "b"]),
+        ("\x1bP1$rx\x1b\\y", ["y"]),
     ],
 )
 async def test_sequences(seq, expected):
@@ -53,3 +65,95 @@ async def test_escape_timeout():
         actual.append(c)
 
     assert actual == ["\x1b", "A"]
+
+
+def test_parser_feed():
+    p = parser.Parser()
+
+    assert p.feed("a\x1b[1") == ["a"]
+    assert p.feed("@b") == [CSI.ICH(1), "b"]
+
+
+def test_parser_flush():
+    p = parser.Parser()
+
+    assert p.feed("a\x1b") == ["a"]
+    assert p.pending_escape
+    assert p.flush() == ["\x1b"]
+    assert not p.pending_escape
+    assert p.flush() == []
+
+
+@pytest.mark.asyncio
+async def test_escape_in_chunk():
+    async def gen():
+        yield "\x1b[A\x1b"
+        yield "OP"
+
+    actual = []
+
+    async for c in parser.parse(gen(), escape_timeout=1000):
+        actual.append(c)
+
+    assert actual == [CSI(final="A"), SS3("P")]
+
+
+@pytest.mark.asyncio
+async def test_escape_at_end():
+    actual = []
+
+    async for c in parser.parse(aiter_str("a\x1b"), escape_timeout=1000):
+        actual.append(c)
+
+    assert actual == ["a", "\x1b"]
+
+
+def test_parser_text_runs():
+    p = parser.Parser(text_runs=True)
+
+    assert p.feed("hello\x1b[Awörld\r\n") == [
+        "hello",
+        CSI(final="A"),
+        "wörld",
+        "\r",
+        "\n",
+    ]
+    assert p.feed("ab\x1bOPcd\x1bN") == ["ab", SS3("P"), "cd"]
+    assert p.feed("xyz") == [SS2("x"), "yz"]
+
+
+@pytest.mark.asyncio
+async def test_parse_batches():
+    async def gen():
+        yield "ab\x1b[A"
+        yield "\x1b["
+        yield "B\x1b"
+
+    actual = []
+
+    async for batch in parser.parse_batches(gen()):
+        actual.append(batch)
+
+    assert actual == [["a", "b", CSI(final="A")], [CSI(final="B")], ["\x1b"]]
+
+
+@pytest.mark.asyncio
+async def test_escape_key_timeout():
+    async def gen():
+        yield "\x1b"
+        await asyncio.sleep(0.1)
+        yield "x"
+        # read with other text, e.g. typed quickly
+        yield "a\x1b"
+        await asyncio.sleep(0.1)
+        yield "x"
+        # a sequence split across reads is joined within the timeout
+        yield "\x1b"
+        yield "[A"
+
+    actual = []
+
+    async for c in parser.parse(gen()):
+        actual.append(c)
+
+    assert actual == ["\x1b", "x", "a", "\x1b", "x", CSI(final="A")]
@@ -0,0 +1,180 @@
+import asyncio
+import contextlib
+import os
+import sys
+
+import pytest
+
+import aioterminal
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="requires a pseudo-terminal"
+)
+
+tty = pytest.importorskip("tty")
+
+
+@pytest.fixture
+def pty():
+    controller, terminal = os.openpty()
+
+    # cbreak mode so that the line discipline doesn't buffer until newline
+    with aioterminal.char_mode(terminal):
+        yield controller, terminal
+
+    os.close(terminal)
+    os.close(controller)
+
+
+@pytest.mark.asyncio
+async def test_read_chunks(pty):
+    controller, terminal = pty
+
+    os.write(controller, b"abc")
+
+    async with contextlib.aclosing(aioterminal.read_chunks(terminal)) as chunks:
+        assert await anext(chunks) == "abc"
+
+
+@pytest.mark.asyncio
+async def test_read_chars(pty):
+    controller, terminal = pty
+
+    os.write(controller, b"ab")
+
+    async with contextlib.aclosing(aioterminal.read_chars(terminal)) as chars:
+        assert await anext(chars) == "a"
+        assert await anext(chars) == "b"
+
+
+@pytest.mark.asyncio
+async def test_read_chunks_split_character(pty):
+    controller, terminal = pty
+
+    async with contextlib.aclosing(aioterminal.read_chunks(terminal)) as chunks:
+        os.write(controller, "aé".encode()[:-1])
+        task = asyncio.ensure_future(anext(chunks))
+        assert await task == "a"
+
+        task = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        os.write(controller, "aé".encode()[-1:])
+        assert await task == "é"
+
+
+@pytest.mark.asyncio
+async def test_read_chunks_errors(pty):
+    controller, terminal = pty
+
+    os.write(controller, b"\xff")
+
+    async with contextlib.aclosing(
+        aioterminal.read_chunks(terminal, errors="replace")
+    ) as chunks:
+        assert await anext(chunks) == "�"
+
+
+@pytest.mark.asyncio
+async def test_read_chunks_errors_strict(pty):
+    controller, terminal = pty
+
+    os.write(controller, b"a\xffb")
+
+    async with contextlib.aclosing(aioterminal.read_chunks(terminal)) as chunks:
+        # the valid part of the read is not lost
+        assert await asyncio.wait_for(anext(chunks), 1) == "a"
+
+        with pytest.raises(UnicodeDecodeError):
+            await asyncio.wait_for(anext(chunks), 1)
+
+
+@pytest.mark.asyncio
+async def test_read_bytes(pty):
+    controller, terminal = pty
+
+    async with contextlib.aclosing(aioterminal.read_bytes(terminal)) as reads:
+        os.write(controller, b"abc")
+        assert await anext(reads) == b"abc"
+
+        os.write(controller, b"\xff")
+        assert await anext(reads) == b"\xff"
+
+
+@pytest.mark.asyncio
+async def test_read_chunks_max_buffered(pty):
+    controller, terminal = pty
+
+    async with contextlib.aclosing(
+        aioterminal.read_chunks(terminal, max_buffered=1)
+    ) as chunks:
+        task = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.01)
+
+        for c in b"abcd":
+            os.write(controller, bytes([c]))
+            await asyncio.sleep(0.01)
+
+        assert await task == "a"
+
+        # reading was paused after "b" was buffered so "c" and "d" stayed in
+        # the kernel buffer and were read later in a single read
+        assert await anext(chunks) == "b"
+        assert await anext(chunks) == "cd"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "read,expected", [(aioterminal.read_chunks, "a"), (aioterminal.read_bytes, b"a")]
+)
+async def test_read_hangup(read, expected):
+    controller, terminal = os.openpty()
+
+    try:
+        # not using char_mode() since it can't be restored after hangup
+        tty.setcbreak(terminal)
+        os.write(controller, b"a")
+
+        async with contextlib.aclosing(read(terminal)) as reads:
+            assert await asyncio.wait_for(anext(reads), 1) == expected
+
+            os.close(controller)
+
+            with pytest.raises(StopAsyncIteration):
+                await asyncio.wait_for(anext(reads), 1)
+    finally:
+        os.close(terminal)
+
+
+@pytest.mark.asyncio
+async def test_read_chunks_hangup_split_character():
+    controller, terminal = os.openpty()
+
+    try:
+        tty.setcbreak(terminal)
+        os.write(controller, "é".encode()[:1])
+
+        async with contextlib.aclosing(aioterminal.read_chunks(terminal)) as chunks:
+            task = asyncio.ensure_future(anext(chunks))
+            await asyncio.sleep(0.01)
+            os.close(controller)
+
+            with pytest.raises(UnicodeDecodeError):
+                await asyncio.wait_for(task, 1)
+
+            with pytest.raises(StopAsyncIteration):
+                await anext(chunks)
+    finally:
+        os.close(terminal)
+
+
+@pytest.mark.asyncio
+async def test_read_chunks_max_buffered_invalid(pty):
+    controller, terminal = pty
+
+    async with contextlib.aclosing(
+        aioterminal.read_chunks(terminal, max_buffered=0)
+    ) as chunks:
+        with pytest.raises(ValueError):
+            await anext(chunks)
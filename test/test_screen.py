@@ -0,0 +1,135 @@
+from aioterminal.codes import CSI, SequenceBuffer
+from aioterminal.screen import Screen
+
+
+def render(screen: Screen) -> bytes:
+    buf = SequenceBuffer()
+    screen.render(buf)
+    return bytes(buf)
+
+
+def test_render_only_changes():
+    screen = Screen(3, 10)
+    screen.put(1, 2, "hello")
+
+    assert render(screen) == b"\x1b[2;3H\x1b[0mhello"
+
+    # nothing changed
+    assert render(screen) == b""
+
+    # same text again
+    screen.put(1, 2, "hello")
+    assert render(screen) == b""
+
+    # cursor moves back and unchanged "ell" is printed again since that is
+    # shorter than moving the cursor over it
+    screen.put(1, 2, "jelly")
+    assert render(screen) == b"\x1b[5Djelly"
+
+
+def test_render_styles():
+    screen = Screen(1, 10)
+    screen.put(0, 0, "ab", (1,))
+    screen.put(0, 2, "cd", (1,))
+    screen.put(0, 4, "e", (31, 42))
+
+    assert render(screen) == b"\x1b[H\x1b[0;1mabcd\x1b[0;31;42me"
+
+
+def test_clip():
+    screen = Screen(2, 4)
+    screen.put(0, -1, "abcdef")
+    screen.put(5, 0, "x")
+
+    assert render(screen) == b"\x1b[H\x1b[0mbcde"
+
+
+def test_invalidate():
+    screen = Screen(1, 3)
+    screen.put(0, 0, "abc")
+    render(screen)
+    screen.invalidate()
+
+    assert render(screen) == bytes(CSI.CUP()) + b"\x1b[0mabc"
+
+
+def test_scroll_up():
+    screen = Screen(6, 5)
+    screen.put(0, 0, "title")
+    lines = [f"line{i}" for i in range(10)]
+
+    for row in range(4):
+        screen.put(row + 1, 0, lines[row])
+
+    screen.put(5, 0, "stat1")
+    render(screen)
+
+    for row in range(4):
+        screen.put(row + 1, 0, lines[row + 1])
+
+    screen.put(5, 0, "stat2")
+
+    # rows 2 to 5 are scrolled up, then only the new line and the changed
+    # character of the status line are printed
+    assert render(screen) == b"\x1b[2;5r\x1b[S\x1b[r\x1b[5Hline4\x1b[6;5H2"
+    assert render(screen) == b""
+
+
+def test_scroll_down_full_screen():
+    screen = Screen(4, 2)
+
+    for row in range(4):
+        screen.put(row, 0, str(row) * 2)
+
+    render(screen)
+
+    for row in range(4):
+        screen.put(row, 0, str(row + 8) * 2 if row < 2 else str(row - 2) * 2)
+
+    assert render(screen) == b"\x1b[2T\x1b[H88\x1b[2H99"
+
+
+def test_no_scroll_for_few_changes():
+    screen = Screen(3, 2)
+    screen.put(0, 0, "ab")
+    screen.put(1, 0, "cd")
+    render(screen)
+    screen.put(0, 0, "cd")
+    screen.put(1, 0, "ef")
+
+    assert render(screen) == b"\x1b[Hcd\x1b[2Hef"
+
+
+def test_many_styles():
+    screen = Screen(2, 3)
+    screen.put(1, 0, "abc", (1,))
+
+    # more styles than fit in the style id arrays over time
+    for i in range(70000):
+        screen.put(0, i % 3, "x", (38, 2, i >> 16, (i >> 8) & 0xFF, i & 0xFF))
+
+        if i % 1000 == 0:
+            render(screen)
+
+    screen.put(0, 0, "yz")
+
+    # still renders only what changed with the right styles
+    assert render(screen) == b"\x1b[H\x1b[0myz\x1b[38;2;1;17;110mx"
+    # unused styles were dropped
+    assert len(screen._styles) < 10000
+
+
+def test_resize():
+    screen = Screen(2, 3)
+    screen.put(0, 0, "abc")
+    screen.put(1, 0, "def", (1,))
+    render(screen)
+
+    screen.resize(1, 4)
+    assert (screen.rows, screen.columns) == (1, 4)
+
+    # everything is drawn again, clipped or extended with spaces
+    assert render(screen) == bytes(CSI.CUP()) + b"\x1b[0mabc "
+
+    screen.put(0, 3, "x")
+    assert render(screen) == b"\x1b[1;4Hx"
@@ -0,0 +1,59 @@
+import pytest
+
+from aioterminal.codes import CSI
+from aioterminal.style import Pen
+
+
+def test_unknown_state_resets():
+    pen = Pen()
+    assert pen.update((1, 31)) == CSI.SGR(0, 1, 31)
+
+
+@pytest.mark.parametrize(
+    "old,new,expected",
+    [
+        ((1, 31), (1, 31), None),
+        ((1, 31), (1, 32), CSI.SGR(32)),
+        ((1, 31), (31,), CSI.SGR(22)),
+        ((1,), (2,), CSI.SGR(0, 2)),
+        ((1, 31), (2, 31), CSI.SGR(22, 2)),
+        ((1,), (1, 2), CSI.SGR(2)),
+        ((4,), (3,), CSI.SGR(0, 3)),
+        ((4, 31), (3, 31), CSI.SGR(3, 24)),
+        ((38, 5, 196), (38, 2, 1, 2, 3), CSI.SGR(38, 2, 1, 2, 3)),
+        ((1, 3, 4, 5, 7, 31, 42), (), CSI.SGR(0)),
+        ((1, 3, 4, 5, 7, 31, 42), (32,), CSI.SGR(0, 32)),
+    ],
+)
+def test_update(old, new, expected):
+    pen = Pen()
+    pen.update(old)
+    assert pen.update(new) == expected
+
+
+@pytest.mark.parametrize(
+    "style,expected",
+    [
+        # underline color sub-parameters are not other attributes
+        ((58, 5, 196), CSI.SGR(0, 58, 5, 196)),
+        ((4, 58, 2, 1, 2, 3), CSI.SGR(0, 4, 58, 2, 1, 2, 3)),
+        ((53,), CSI.SGR(0, 53)),
+        # unknown parameters are kept
+        ((6,), CSI.SGR(0, 6)),
+    ],
+)
+def test_other_attributes(style, expected):
+    assert Pen().update(style) == expected
+
+
+def test_other_attributes_transition():
+    pen = Pen()
+    pen.update((53, 58, 5, 1, 31))
+
+    assert pen.update((58, 5, 1, 31)) == CSI.SGR(55)
+    assert pen.update((31,)) == CSI.SGR(59)
+
+    # unknown parameters can only be undone with a full reset
+    pen.update((6, 31))
+    assert pen.update((31,)) == CSI.SGR(0, 31)
+    assert pen.update((6, 31)) == CSI.SGR(0, 31, 6)
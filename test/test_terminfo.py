@@ -0,0 +1,165 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from aioterminal import terminfo
+from aioterminal.codes import CSI, SS3
+from aioterminal.keys import Key, KeyEvent, Modifier, key_event
+
+XTERM = terminfo.find("xterm")
+
+needs_xterm = pytest.mark.skipif(XTERM is None, reason="no terminfo for xterm")
+
+
+@pytest.fixture
+def term_dir(tmp_path, monkeypatch):
+    """
+    Private copy of the xterm terminfo and an empty cache.
+    """
+    if XTERM is None:
+        pytest.skip("no terminfo for xterm")
+
+    os.mkdir(tmp_path / "x")
+    shutil.copy(XTERM, tmp_path / "x" / "xterm-test")
+    monkeypatch.setenv("TERMINFO", str(tmp_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    return tmp_path
+
+
+@needs_xterm
+@pytest.mark.parametrize(
+    "name,index",
+    [
+        ("kbs", 55),
+        ("kdch1", 59),
+        ("kcud1", 61),
+        ("kf1", 66),
+        ("kf10", 67),
+        ("kf9", 75),
+        ("khome", 76),
+        ("kich1", 77),
+        ("kcub1", 79),
+        ("knp", 81),
+        ("kpp", 82),
+        ("kcuf1", 83),
+        ("kcuu1", 87),
+        ("kcbt", 148),
+        ("kbeg", 158),
+        ("kend", 164),
+        ("kent", 165),
+        ("kDC", 191),
+        ("kRIT", 210),
+        ("kf11", 216),
+        ("kf20", 225),
+    ],
+)
+def test_indexes_match_curses(name, index):
+    curses = pytest.importorskip("curses")
+    curses.setupterm("xterm")
+
+    with open(XTERM, "rb") as f:
+        strings = terminfo.read_strings(f.read())
+
+    assert strings[index] == curses.tigetstr(name)
+
+
+def test_read_strings_invalid():
+    with pytest.raises(ValueError):
+        terminfo.read_strings(b"")
+
+    with pytest.raises(ValueError):
+        terminfo.read_strings(b"\0" * 12)
+
+
+def test_load_keys(term_dir):
+    keys = terminfo.load_keys("xterm-test")
+
+    # events are interned
+    assert keys[SS3("A")] is key_event(CSI(final="A"))
+    assert keys[CSI(params="3;2", final="~")] == KeyEvent(Key.DELETE, Modifier.SHIFT)
+    assert keys["\x7f"] == KeyEvent(Key.BACKSPACE, text="\x7f")
+
+
+def test_load_keys_missing(term_dir):
+    assert terminfo.load_keys("no-such-terminal") == {}
+    assert terminfo.load_keys("") == {}
+
+
+def test_load_keys_cache(term_dir):
+    terminfo.load_keys("xterm-test")
+    cache_path = term_dir / "cache" / "aioterminal" / "terminfo-xterm-test.json"
+
+    with open(cache_path) as f:
+        cached = json.load(f)
+
+    # change the cache to show that it is used
+    cached["keys"] = {"\x1bOA": ["F1", 0]}
+
+    with open(cache_path, "w") as f:
+        json.dump(cached, f)
+
+    assert terminfo.load_keys("xterm-test") == {SS3("A"): KeyEvent(Key.F1)}
+
+    # the cache is not used when the terminfo file changes
+    stat = os.stat(term_dir / "x" / "xterm-test")
+    os.utime(term_dir / "x" / "xterm-test", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert terminfo.load_keys("xterm-test")[SS3("A")] == KeyEvent(Key.UP_ARROW)
+
+
+def test_key_event_fallback():
+    fallback = {CSI(final="x"): KeyEvent(Key.F1), "\x08": KeyEvent(Key.BACKSPACE)}
+
+    # the fallback takes precedence over Ctrl+letter
+    assert key_event("\x08", fallback) == KeyEvent(Key.BACKSPACE)
+
+    assert key_event(CSI(final="x")) is None
+    assert key_event(CSI(final="x"), fallback) == KeyEvent(Key.F1)
+    # built-in xterm keys take precedence
+    assert key_event(CSI(final="A"), {CSI(final="A"): KeyEvent(Key.F1)}) == KeyEvent(
+        Key.UP_ARROW
+    )
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [
+        {"\x1bOA": ["F21", 0]},
+        {"\x1bOA": ["F1"]},
+        {"\x1bOA": ["F1", "0"]},
+        {"\x1bOA": "F1"},
+        ["F1"],
+        None,
+    ],
+)
+def test_load_keys_invalid_cache(term_dir, keys):
+    terminfo.load_keys("xterm-test")
+    cache_path = term_dir / "cache" / "aioterminal" / "terminfo-xterm-test.json"
+
+    with open(cache_path) as f:
+        cached = json.load(f)
+
+    cached["keys"] = keys
+
+    with open(cache_path, "w") as f:
+        json.dump(cached, f)
+
+    # the terminfo file is read again
+    assert terminfo.load_keys("xterm-test")[SS3("A")] == KeyEvent(Key.UP_ARROW)
+
+
+def test_backspace_is_ctrl_h(tmp_path, monkeypatch):
+    # vt100 has kbs=^H
+    if terminfo.find("vt100") is None:
+        pytest.skip("no terminfo for vt100")
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    keys = terminfo.load_keys("vt100")
+
+    assert key_event("\x08", keys) == KeyEvent(Key.BACKSPACE, text="\x08")
+    # without terminfo, it's Ctrl+H
+    assert key_event("\x08") == KeyEvent(None, Modifier.CTRL, "h")
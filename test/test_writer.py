@@ -0,0 +1,125 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+from aioterminal import writer as writer_module
+from aioterminal.codes import CSI
+from aioterminal.writer import Writer
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="requires a pseudo-terminal"
+)
+
+tty = pytest.importorskip("tty")
+
+
+@pytest.fixture
+def pty():
+    controller, terminal = os.openpty()
+    tty.setraw(terminal)
+
+    yield controller, terminal
+
+    os.close(terminal)
+    os.close(controller)
+
+
+async def read_all(fd: int, size: int) -> bytes:
+    loop = asyncio.get_running_loop()
+    data = bytearray()
+
+    while len(data) < size:
+        data += await loop.run_in_executor(None, os.read, fd, size - len(data))
+
+    return bytes(data)
+
+
+@pytest.mark.asyncio
+async def test_write(pty):
+    controller, terminal = pty
+
+    async with Writer(terminal) as writer:
+        writer.write(b"hello")
+        await writer.drain()
+
+    assert await read_all(controller, 5) == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_drain(pty):
+    controller, terminal = pty
+    data = bytes(range(256)) * 4096
+
+    async with Writer(terminal, high_water=1024) as writer:
+        writer.write(data)
+
+        # nothing is reading the other end, so the pty buffer fills up
+        assert writer.buffered > 1024
+
+        drain = asyncio.ensure_future(writer.drain())
+        await asyncio.sleep(0.01)
+        assert not drain.done()
+
+        assert await read_all(controller, len(data)) == data
+        await drain
+        assert writer.buffered == 0
+
+
+@pytest.mark.asyncio
+async def test_not_blocking_original_fd(pty):
+    controller, terminal = pty
+
+    async with Writer(terminal):
+        assert os.get_blocking(terminal)
+
+
+@pytest.mark.asyncio
+async def test_write_frame(pty):
+    controller, terminal = pty
+    data = bytes(range(256)) * 4096
+
+    async with Writer(terminal) as writer:
+        writer.write(data)
+
+        # terminal isn't keeping up, so only the last frame should be written
+        writer.write_frame(b"1")
+        writer.write_frame(b"2")
+        writer.write_frame(b"3")
+
+        assert writer.frames_dropped == 2
+        assert await read_all(controller, len(data) + 1) == data + b"3"
+        await writer.flush()
+
+        assert writer.frames_written == 1
+        assert writer.frames_dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_frame(pty, monkeypatch):
+    controller, terminal = pty
+    monkeypatch.setattr(writer_module, "_synchronized_output_cache", {})
+
+    async with Writer(terminal) as writer:
+        with writer.frame() as buf:
+            buf.append(CSI.CUP(1, 1), "hi")
+
+        assert await read_all(controller, 24) == b"\x1b[?2026h\x1b[1;1Hhi\x1b[?2026l"
+
+        writer.probe_synchronized_output()
+        assert await read_all(controller, 12) == b"\x1b[?2026$p\x1b[c"
+
+        assert not writer.handle_reply("a")
+        assert writer.handle_reply(CSI("?", "2026;0", "$", "y"))
+        assert writer.handle_reply(CSI("?", "1;2", "", "c"))
+        assert writer.synchronized_output is False
+
+        with writer.frame() as buf:
+            buf.append("hi")
+
+        assert await read_all(controller, 2) == b"hi"
+
+    async with Writer(terminal) as writer:
+        # result is cached
+        assert writer.synchronized_output is False